@@ -1,14 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import blog as crud_blog
 from app.schemas.blog import BlogCreate, BlogUpdate, BlogResponse
+from app.models.blog import BlogPost
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryResponse
+from app.utils.conditional import not_modified, row_validator
+from app.utils.pagination import set_page_headers
+from app.utils.response_cache import CachedRoute, cache_response
 import re
 
-router = APIRouter(prefix="/blog", tags=["Blog"])
+router = APIRouter(prefix="/blog", tags=["Blog"], route_class=CachedRoute)
 
 
 # ─── Category endpoints ────────────────────────────────────────────────────────
@@ -47,22 +51,29 @@ def delete_blog_category(category_id: int, db: Session = Depends(get_db)):
 # ─── Blog post endpoints ───────────────────────────────────────────────────────
 
 @router.get("/", response_model=List[BlogResponse])
+@cache_response("blog_posts")
 def get_blog_posts(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False, description="Send X-Total-Count (or X-Total-Estimate)"),
     db: Session = Depends(get_db)
 ):
-    if search:
-        return crud_blog.search(db, query=search)
-    elif category:
-        return crud_blog.get_by_category(db, category=category)
-    return crud_blog.get_all_ordered(db, skip=skip, limit=limit)
+    page = crud_blog.get_page(
+        db, category=category, search=search, cursor=cursor, limit=limit, with_total=include_total
+    )
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/{post_id}", response_model=BlogResponse)
-def get_blog_post(post_id: int, db: Session = Depends(get_db)):
+def get_blog_post(post_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    unchanged = not_modified(request, row_validator(db, BlogPost, BlogPost.id == post_id), response)
+    if unchanged:
+        return unchanged
     post = crud_blog.get(db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
@@ -70,7 +81,10 @@ def get_blog_post(post_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/slug/{slug}", response_model=BlogResponse)
-def get_blog_post_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_blog_post_by_slug(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    unchanged = not_modified(request, row_validator(db, BlogPost, BlogPost.slug == slug), response)
+    if unchanged:
+        return unchanged
     post = crud_blog.get_by_slug(db, slug=slug)
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
@@ -1,38 +1,45 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import contact as crud_contact
 from app.schemas.contact import ContactCreate, ContactResponse
+from app.utils.pagination import set_page_headers
 
 router = APIRouter(prefix="/contacts", tags=["Contacts"])
 
 
 @router.get("/", response_model=List[ContactResponse], dependencies=[Depends(require_admin)])
 def get_contacts(
-    skip: int = Query(0, ge=0),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False, description="Send X-Total-Count (or X-Total-Estimate)"),
     unread_only: bool = Query(False, description="Show only unread submissions"),
     db: Session = Depends(get_db)
 ):
     """
-    Get all contact submissions.
+    Get contact submissions (newest first), one page at a time.
     Admin only endpoint.
     
     Args:
-        skip: Number of records to skip
+        request: Incoming request (used to build the Link header)
+        response: Response the page headers are set on
+        cursor: X-Next-Cursor of the previous page (omit for the first page)
         limit: Maximum number of records
+        include_total: Send the total as X-Total-Count (X-Total-Estimate on large tables)
         unread_only: Filter for unread submissions only
         db: Database session
         
     Returns:
         List of contact submissions
     """
-    if unread_only:
-        contacts = crud_contact.get_unread(db)
-    else:
-        contacts = crud_contact.get_all_ordered(db, skip=skip, limit=limit)
-    return contacts
+    page = crud_contact.get_page(
+        db, unread_only=unread_only, cursor=cursor, limit=limit, with_total=include_total
+    )
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/{contact_id}", response_model=ContactResponse, dependencies=[Depends(require_admin)])
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import require_admin
+from app.storage import get_media_cache, get_storage, get_storage_executor
+from app.utils.image_executor import get_image_executor
+from app.utils.media_cleanup import get_media_cleanup
+from app.utils.response_cache import get_response_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/", dependencies=[Depends(require_admin)])
+def get_metrics():
+    """
+    Runtime counters for this worker process.
+    Admin only endpoint.
+    
+    Returns:
+        Cache statistics keyed by subsystem (None when disabled)
+    """
+    cache = get_media_cache()
+    breaker = get_storage().breaker
+    return {
+        "media_cache": cache.stats() if cache is not None else None,
+        "storage_io": get_storage_executor().stats(),
+        "storage_breaker": breaker.stats() if breaker is not None else None,
+        "image_jobs": get_image_executor().stats(),
+        "media_cleanup": get_media_cleanup().stats(),
+        "response_cache": get_response_cache().stats(),
+    }
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import project as crud_project
@@ -11,15 +11,20 @@ from app.schemas.project import (
     ProjectImageResponse,
 )
 from app.models.category import Category
+from app.models.project import Project
 from app.schemas.category import CategoryCreate, CategoryResponse
+from app.utils.conditional import not_modified, row_validator
+from app.utils.pagination import set_page_headers
+from app.utils.response_cache import CachedRoute, cache_response
 import re
 
-router = APIRouter(prefix="/projects", tags=["Projects"])
+router = APIRouter(prefix="/projects", tags=["Projects"], route_class=CachedRoute)
 
 
 # ─── Category endpoints ────────────────────────────────────────────────────────
 
 @router.get("/categories", response_model=List[CategoryResponse])
+@cache_response("categories")
 def get_project_categories(db: Session = Depends(get_db)):
     """Get all project categories"""
     return db.query(Category).filter(Category.type == "project").order_by(Category.name).all()
@@ -53,16 +58,23 @@ def delete_project_category(category_id: int, db: Session = Depends(get_db)):
 # ─── Project endpoints ─────────────────────────────────────────────────────────
 
 @router.get("/", response_model=List[ProjectResponse])
+@cache_response("projects", "project_images")
 def get_projects(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False, description="Send X-Total-Count (or X-Total-Estimate)"),
     db: Session = Depends(get_db)
 ):
-    if category:
-        return crud_project.get_by_category(db, category=category)
-    return crud_project.get_all_with_images(db)
+    page = crud_project.get_page(db, category=category, cursor=cursor, limit=limit, with_total=include_total)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/featured", response_model=List[ProjectResponse])
+@cache_response("projects", "project_images")
 def get_featured_projects(
     db: Session = Depends(get_db),
     limit: int = Query(3, ge=1, le=10)
@@ -71,7 +83,11 @@ def get_featured_projects(
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+def get_project(project_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    validator = row_validator(db, Project, Project.id == project_id, children=Project.images)
+    unchanged = not_modified(request, validator, response)
+    if unchanged:
+        return unchanged
     project = crud_project.get(db, id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -79,7 +95,11 @@ def get_project(project_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/slug/{slug}", response_model=ProjectResponse)
-def get_project_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_project_by_slug(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    validator = row_validator(db, Project, Project.slug == slug, children=Project.images)
+    unchanged = not_modified(request, validator, response)
+    if unchanged:
+        return unchanged
     project = crud_project.get_by_slug(db, slug=slug)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -8,6 +8,8 @@ from app.api.v1 import (
     testimonials,
     social_media,
     upload,
+    metrics,
+    site,
 )
 
 # Create main API router
@@ -21,4 +23,6 @@ api_router.include_router(blog.router)
 api_router.include_router(contacts.router)
 api_router.include_router(testimonials.router)
 api_router.include_router(social_media.router)
-api_router.include_router(upload.router, prefix="/upload", tags=["upload"])
\ No newline at end of file
+api_router.include_router(upload.router, prefix="/upload", tags=["upload"])
+api_router.include_router(metrics.router)
+api_router.include_router(site.router)
\ No newline at end of file
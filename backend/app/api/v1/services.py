@@ -1,14 +1,18 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import service as crud_service
+from app.models.service import Service
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from app.utils.conditional import not_modified, row_validator
+from app.utils.response_cache import CachedRoute, cache_response
 
-router = APIRouter(prefix="/services", tags=["Services"])
+router = APIRouter(prefix="/services", tags=["Services"], route_class=CachedRoute)
 
 
 @router.get("/", response_model=List[ServiceResponse])
+@cache_response("services")
 def get_services(db: Session = Depends(get_db)):
     """
     Get all services.
@@ -25,13 +29,16 @@ def get_services(db: Session = Depends(get_db)):
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-def get_service(service_id: int, db: Session = Depends(get_db)):
+def get_service(service_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get a single service by ID.
     Public endpoint - no authentication required.
+    Answers 304 when the client's ETag / Last-Modified is still current.
     
     Args:
         service_id: Service ID
+        request: Incoming request (conditional headers)
+        response: Response the validator headers are set on
         db: Database session
         
     Returns:
@@ -40,6 +47,9 @@ def get_service(service_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: 404 if service not found
     """
+    unchanged = not_modified(request, row_validator(db, Service, Service.id == service_id), response)
+    if unchanged:
+        return unchanged
     service = crud_service.get(db, id=service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
@@ -47,13 +57,16 @@ def get_service(service_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/slug/{slug}", response_model=ServiceResponse)
-def get_service_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_service_by_slug(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get a single service by slug.
     Public endpoint - no authentication required.
+    Answers 304 when the client's ETag / Last-Modified is still current.
     
     Args:
         slug: Service slug
+        request: Incoming request (conditional headers)
+        response: Response the validator headers are set on
         db: Database session
         
     Returns:
@@ -62,6 +75,9 @@ def get_service_by_slug(slug: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException: 404 if service not found
     """
+    unchanged = not_modified(request, row_validator(db, Service, Service.slug == slug), response)
+    if unchanged:
+        return unchanged
     service = crud_service.get_by_slug(db, slug=slug)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
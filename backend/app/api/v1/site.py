@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.crud import blog as crud_blog
+from app.crud import project as crud_project
+from app.crud import service as crud_service
+from app.crud import social_media as crud_social_media
+from app.crud import testimonial as crud_testimonial
+from app.schemas.site import SiteBundleResponse
+from app.utils.response_cache import CachedRoute, cache_response
+
+router = APIRouter(prefix="/site", tags=["Site"], route_class=CachedRoute)
+
+
+@router.get("/home", response_model=SiteBundleResponse)
+@cache_response("projects", "project_images", "testimonials", "services", "social_media_links", "blog_posts")
+def get_home_bundle(
+    db: Session = Depends(get_db),
+    projects: int = Query(3, ge=1, le=10, description="Number of featured projects"),
+    testimonials: int = Query(3, ge=1, le=10, description="Number of featured testimonials"),
+    posts: int = Query(3, ge=1, le=20, description="Number of latest blog posts"),
+):
+    """
+    Get all public homepage content in one response.
+    Public endpoint - no authentication required.
+    
+    Replaces the separate featured projects, featured testimonials,
+    services, social links and blog requests. Everything is read in one
+    session and transaction, so the sections are consistent with each
+    other. The serialised bundle is cached until any of its tables changes
+    and carries an ETag for conditional GETs.
+    
+    Args:
+        db: Database session
+        projects: Maximum number of featured projects
+        testimonials: Maximum number of featured testimonials
+        posts: Maximum number of blog posts (newest first)
+        
+    Returns:
+        Homepage sections keyed by name
+    """
+    return {
+        "featured_projects": crud_project.get_featured(db, limit=projects),
+        "featured_testimonials": crud_testimonial.get_featured(db, limit=testimonials),
+        "services": crud_service.get_all(db),
+        "social_links": crud_social_media.get_active(db),
+        "blog_posts": crud_blog.get_all_ordered(db, limit=posts),
+    }
@@ -4,8 +4,9 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import social_media as crud_social_media
 from app.schemas.social_media import SocialMediaCreate, SocialMediaUpdate, SocialMediaResponse
+from app.utils.response_cache import CachedRoute, cache_response
 
-router = APIRouter(prefix="/social-media", tags=["Social Media"])
+router = APIRouter(prefix="/social-media", tags=["Social Media"], route_class=CachedRoute)
 
 
 @router.get("/", response_model=List[SocialMediaResponse], dependencies=[Depends(require_admin)])
@@ -25,6 +26,7 @@ def get_all_social_media(db: Session = Depends(get_db)):
 
 
 @router.get("/active", response_model=List[SocialMediaResponse])
+@cache_response("social_media_links")
 def get_active_social_media(db: Session = Depends(get_db)):
     """
     Get active social media links only.
@@ -1,47 +1,79 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.crud import testimonial as crud_testimonial
 from app.schemas.testimonial import TestimonialCreate, TestimonialUpdate, TestimonialResponse
+from app.utils.pagination import set_page_headers
+from app.utils.response_cache import CachedRoute, cache_response
 
-router = APIRouter(prefix="/testimonials", tags=["Testimonials"])
+router = APIRouter(prefix="/testimonials", tags=["Testimonials"], route_class=CachedRoute)
 
 
 @router.get("/", response_model=List[TestimonialResponse], dependencies=[Depends(require_admin)])
-def get_all_testimonials(db: Session = Depends(get_db)):
+def get_all_testimonials(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False, description="Send X-Total-Count (or X-Total-Estimate)"),
+    db: Session = Depends(get_db)
+):
     """
-    Get all testimonials (including inactive).
+    Get all testimonials (including inactive), one page at a time.
     Admin only endpoint.
     
     Args:
+        request: Incoming request (used to build the Link header)
+        response: Response the page headers are set on
+        cursor: X-Next-Cursor of the previous page (omit for the first page)
+        limit: Maximum number of records
+        include_total: Send the total as X-Total-Count (X-Total-Estimate on large tables)
         db: Database session
         
     Returns:
-        List of all testimonials ordered by order_index
+        List of testimonials ordered by order_index
     """
-    testimonials = crud_testimonial.get_all_ordered(db)
-    return testimonials
+    page = crud_testimonial.get_page(db, cursor=cursor, limit=limit, with_total=include_total)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/active", response_model=List[TestimonialResponse])
-def get_active_testimonials(db: Session = Depends(get_db)):
+@cache_response("testimonials")
+def get_active_testimonials(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=100),
+    include_total: bool = Query(False, description="Send X-Total-Count (or X-Total-Estimate)"),
+    db: Session = Depends(get_db)
+):
     """
-    Get active testimonials only.
+    Get active testimonials only, one page at a time.
     Public endpoint - no authentication required.
     This is what your frontend will call to display testimonials.
     
     Args:
+        request: Incoming request (used to build the Link header)
+        response: Response the page headers are set on
+        cursor: X-Next-Cursor of the previous page (omit for the first page)
+        limit: Maximum number of records
+        include_total: Send the total as X-Total-Count (X-Total-Estimate on large tables)
         db: Database session
         
     Returns:
         List of active testimonials ordered by order_index
     """
-    testimonials = crud_testimonial.get_active(db)
-    return testimonials
+    page = crud_testimonial.get_page(
+        db, active_only=True, cursor=cursor, limit=limit, with_total=include_total
+    )
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/featured", response_model=List[TestimonialResponse])
+@cache_response("testimonials")
 def get_featured_testimonials(
     db: Session = Depends(get_db),
     limit: int = Query(3, ge=1, le=10, description="Number of featured testimonials to return")
@@ -1,10 +1,32 @@
-import io
+import asyncio
 import os
+import time
 import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Iterator, List, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Query
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
 from app.core.config import settings
 from app.core.security import check_admin_session
+from app.database import run_db
+from app.storage import (
+    get_storage, get_media_cache, get_storage_executor, run_storage,
+    StorageError, ObjectNotFound, InvalidRange,
+)
+from app.storage.base import is_byte_range
+from app.schemas.upload import FinalizeRequest, PresignRequest
+from app.utils.files import (
+    SpooledUpload, content_key, file_too_large, object_exists, spool_upload, spool_stored_object,
+    storage_error, store_image_derivatives, register_upload,
+)
+from app.utils.media import count_references
+from app.utils.media_cleanup import get_media_cleanup
+from app.utils.image_executor import get_image_executor
+from app.utils.http import http_date, if_range_matches, is_not_modified
+from app.utils.images import FORMATS, derivative_key, render_variant, snap_quality, snap_width
+from app.utils.cache import TTLCache
+from app.utils.singleflight import SingleFlight
 
 
 def require_admin(request: Request) -> None:
@@ -17,138 +39,350 @@ router = APIRouter()
 
 ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp"}
 
+# Direct browser uploads land here until /finalize moves them to their content key
+STAGING_PREFIX = "uploads/"
 
-def _safe_filename(original: str) -> str:
-    ext = original.rsplit(".", 1)[-1].lower() if "." in original else "jpg"
-    return f"{uuid.uuid4().hex}.{ext}"
+# In-flight on-the-fly derivative renders, keyed by derivative key
+_variant_flight = SingleFlight()
 
+# In-flight media lookups (HEAD), keyed by object path
+_media_flight = SingleFlight()
 
-def _get_content_type(filename: str) -> str:
-    ext = filename.rsplit(".", 1)[-1].lower()
-    return {
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "png": "image/png",
-        "webp": "image/webp",
-    }.get(ext, "image/jpeg")
+# Objects one request is currently teeing into the disk cache. Concurrent
+# misses stream on their own instead of writing a second copy; a marker
+# whose stream never started simply expires.
+_media_fills = TTLCache(maxsize=settings.MEDIA_HEAD_CACHE_SIZE, ttl=60)
 
+# Presigned GET URLs for redirect delivery: key -> (url, monotonic expiry).
+# Entries are dropped MEDIA_PRESIGN_MARGIN seconds before the signature
+# expires, so a client following a cached redirect always gets a valid URL.
+_presign_cache = TTLCache(
+    maxsize=settings.MEDIA_PRESIGN_CACHE_SIZE,
+    ttl=max(settings.MEDIA_PRESIGN_EXPIRES - settings.MEDIA_PRESIGN_MARGIN, 0),
+)
 
-def _get_s3_client():
-    """Create and return a boto3 S3 client."""
-    try:
-        import boto3
-        from botocore.client import Config
-
-        return boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-            region_name=settings.S3_REGION,
-            config=Config(signature_version="s3v4"),
-        )
-    except ImportError:
-        raise HTTPException(
-            status_code=500,
-            detail="boto3 not installed. Add 'boto3' to requirements.txt"
-        )
 
+# File extension stored for each accepted content type
+EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+
+# ── Upload helpers ─────────────────────────────────────────────────────────────
+async def _store_upload(
+    db: Session,
+    upload: SpooledUpload,
+    content_type: str,
+    staged_key: Optional[str] = None,
+) -> dict:
+    """
+    Stream the spooled file through the configured storage backend and
+    describe it. The key is derived from the file's SHA-256, so a file that
+    is already stored is not uploaded again. A direct upload already in the
+    bucket under `staged_key` is copied server-side instead of re-uploaded.
+    """
+    storage = get_storage()
+    key = content_key(upload.sha256, EXTENSIONS[content_type])
 
-# ── Railway S3 upload ──────────────────────────────────────────────────────────
-def _upload_to_s3(file_bytes: bytes, filename: str, subfolder: str) -> dict:
     try:
-        s3 = _get_s3_client()
-        key = f"{subfolder}/{filename}" if subfolder else filename
-
-        s3.put_object(
-            Bucket=settings.S3_BUCKET,
-            Key=key,
-            Body=file_bytes,
-            ContentType=_get_content_type(filename),
+        existing = await run_storage(object_exists, key)
+        if not existing:
+            if staged_key:
+                await run_storage(storage.copy, staged_key, key, content_type)
+            else:
+                await run_storage(storage.save_file, key, upload.path, content_type)
+        # The image workers read the spooled copy themselves
+        derivatives, image_meta = await asyncio.gather(
+            store_image_derivatives(key, upload.path, existing=existing),
+            register_upload(db, key, upload, content_type),
         )
+    except StorageError as e:
+        raise storage_error(e, status_code=500)
 
-        # Return a proxied URL through our own backend instead of direct S3 URL.
-        # This avoids the Tigris/Railway S3 public access problem entirely —
-        # images are served through FastAPI which already has correct CORS headers.
-        proxy_url = f"{settings.BACKEND_URL}/api/v1/upload/media/{key}"
+    # A row is about to reference the key; don't let a pending cleanup take it
+    get_media_cleanup().hold(key)
+    return {
+        "message": f"File uploaded to {storage.label}",
+        "file_path": key,
+        "deduplicated": existing,
+        "url": storage.url(key),
+        "full_url": storage.full_url(key),
+        "derivatives": derivatives,
+        "image_meta": image_meta,
+    }
 
-        return {
-            "message": "File uploaded to Railway S3",
-            "file_path": key,
-            "url": proxy_url,
-            "full_url": proxy_url,
-        }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"S3 upload failed: {str(e)}")
+# ── Media proxy helpers ────────────────────────────────────────────────────────
 
+def _media_headers(etag: Optional[str], last_modified) -> dict:
+    headers = {
+        # Cache aggressively on the client — images don't change
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
 
-# ── Local upload (development) ─────────────────────────────────────────────────
-def _upload_to_local(file_bytes: bytes, filename: str, subfolder: str) -> dict:
-    upload_dir = os.path.join(settings.UPLOAD_DIR, subfolder) if subfolder else settings.UPLOAD_DIR
-    os.makedirs(upload_dir, exist_ok=True)
 
-    file_path = os.path.join(upload_dir, filename)
-    with open(file_path, "wb") as f:
-        f.write(file_bytes)
+def _filling(file_path: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Pass `chunks` through, clearing the fill marker once they end or are abandoned."""
+    try:
+        yield from chunks
+    finally:
+        _media_fills.pop(file_path)
 
-    relative_url = f"/static/{subfolder}/{filename}" if subfolder else f"/static/{filename}"
 
-    return {
-        "message": "File uploaded locally",
-        "file_path": file_path,
-        "url": relative_url,
-        "full_url": f"http://localhost:8000{relative_url}",
-    }
+async def _serve_object(request: Request, file_path: str) -> Response:
+    """
+    Build the response for one stored object, honouring conditional and
+    Range headers. Every blocking storage call, including reading the body,
+    runs in the storage I/O pool so a slow bucket never stalls the loop.
+
+    A cache miss looks the object up through a single flight per object
+    path, so a burst of requests for the same uncached (or missing) key
+    costs one HEAD. The body is then streamed chunk by chunk, and the first
+    full response is teed into the disk cache as it goes out; requests
+    arriving during that fill stream the object themselves. A key that is
+    not found is remembered for MEDIA_MISS_CACHE_TTL seconds, so repeated
+    requests for it are answered without a HEAD.
+    """
+    storage = get_storage()
+    cache = get_media_cache()
+    io = get_storage_executor()
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    cached = await io.run(cache.get, file_path) if cache is not None else None
+
+    try:
+        info = cached
+        if info is None:
+            info = await _media_flight.do(file_path, lambda: io.run(storage.stat, file_path))
+
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            if is_not_modified(request.headers, info.etag, info.last_modified):
+                return Response(status_code=304, headers=_media_headers(info.etag, info.last_modified))
+
+        if range_header and if_range and not if_range_matches(if_range, info.etag):
+            # Only honour the range if the client's copy is still current
+            range_header = None
+
+        obj = None
+        if cached is not None:
+            path = cache.data_path(file_path)
+            try:
+                stat_result = os.stat(path)
+                if not is_byte_range(range_header):
+                    return FileResponse(
+                        path,
+                        stat_result=stat_result,
+                        media_type=cached.content_type,
+                        headers=_media_headers(cached.etag, cached.last_modified),
+                    )
+                obj = await io.run(cache.open, cached, byte_range=range_header)
+            except FileNotFoundError:
+                # Evicted by another worker since the lookup: read from
+                # storage and refill the cache below
+                cache.forget(file_path)
+                cached = None
+
+        if obj is None:
+            obj = await io.run(storage.open, file_path, byte_range=range_header)
+    except InvalidRange:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Accept-Ranges": "bytes"},
+        )
+    except ObjectNotFound:
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+    except StorageError as e:
+        raise storage_error(e)
+
+    body = obj.iter_chunks(settings.MEDIA_CHUNK_SIZE)
+    if obj.info and cached is None:
+        storage.remember(obj.info)
+        if cache is not None and cache.accepts(obj.info) and _media_fills.get(file_path) is None:
+            _media_fills.set(file_path, True)
+            body = _filling(file_path, cache.tee(obj.info, body))
+
+    headers = _media_headers(obj.etag, obj.last_modified)
+    if obj.content_length is not None:
+        headers["Content-Length"] = str(obj.content_length)
+    if obj.content_range:
+        headers["Content-Range"] = obj.content_range
+
+    return StreamingResponse(
+        io.iterate(body),
+        status_code=206 if obj.content_range else 200,
+        media_type=obj.content_type,
+        headers=headers,
+    )
+
+
+async def _redirect_to_object(file_path: str) -> Response:
+    """Redirect to a (memoised) presigned GET URL for one stored object."""
+    cached = _presign_cache.get(file_path)
+    if cached is None:
+        storage = get_storage()
+        try:
+            await run_storage(storage.stat, file_path)  # 404 here rather than an S3 error page
+            url = storage.presign_get(file_path, settings.MEDIA_PRESIGN_EXPIRES)
+        except ObjectNotFound:
+            raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+        except StorageError as e:
+            raise storage_error(e)
+        cached = (url, time.monotonic() + _presign_cache.ttl)
+        _presign_cache.set(file_path, cached)
+
+    url, usable_until = cached
+    # Clients may reuse the redirect only while the URL stays usable
+    max_age = max(int(usable_until - time.monotonic()), 0)
+    return RedirectResponse(
+        url,
+        status_code=settings.MEDIA_REDIRECT_STATUS,
+        headers={"Cache-Control": f"private, max-age={max_age}"},
+    )
+
+
+async def _deliver(request: Request, file_path: str) -> Response:
+    """
+    Serve an object according to MEDIA_DELIVERY. While the storage circuit
+    breaker is open, redirects are skipped in favour of the local media
+    cache (or a fast 503 when the object is not cached).
+    """
+    if settings.MEDIA_DELIVERY == "redirect" and get_storage().available:
+        return await _redirect_to_object(file_path)
+    return await _serve_object(request, file_path)
+
 
+async def _ensure_variant(
+    request: Request,
+    file_path: str,
+    w: Optional[int],
+    fmt: Optional[str],
+    q: Optional[int],
+) -> Tuple[str, bool]:
+    """
+    Resolve transform parameters to a derivative key, rendering and storing
+    the derivative first if it does not exist yet.
 
-# ── Delete from S3 ─────────────────────────────────────────────────────────────
-def _delete_from_s3(key: str) -> None:
+    Returns:
+        (derivative key, whether the format was negotiated from Accept)
+    """
+    negotiated = fmt is None
+    if fmt is None:
+        fmt = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+    fmt = {"jpg": "jpeg"}.get(fmt.lower(), fmt.lower())
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}'. Use webp or jpeg.")
+
+    ladder = settings.image_derivative_widths
+    width = snap_width(w, ladder) if w else ladder[-1]
+    quality = snap_quality(q) if q else settings.IMAGE_QUALITY
+    variant_key = derivative_key(file_path, width, fmt, quality)
+
+    storage = get_storage()
+    cache = get_media_cache()
+    if not storage.available and cache is not None and await run_storage(cache.get, variant_key):
+        # Storage is failing fast; a cached copy of the variant is enough
+        return variant_key, negotiated
     try:
-        s3 = _get_s3_client()
-        s3.delete_object(Bucket=settings.S3_BUCKET, Key=key)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"S3 delete failed: {str(e)}")
+        try:
+            await run_storage(storage.stat, variant_key)
+        except ObjectNotFound:
+            # Concurrent requests for the same variant share a single render
+            await _variant_flight.do(
+                variant_key,
+                lambda: _render_variant(file_path, variant_key, width, fmt, quality),
+            )
+    except ObjectNotFound:
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+    except StorageError as e:
+        raise storage_error(e)
+
+    return variant_key, negotiated
+
+
+def _read_object(file_path: str) -> bytes:
+    obj = get_storage().open(file_path)
+    try:
+        return obj.body.read()
+    finally:
+        obj.body.close()
+
+
+async def _render_variant(file_path: str, variant_key: str, width: int, fmt: str, quality: int) -> None:
+    """Decode the original once, resize/re-encode it and persist it under `variant_key`."""
+    data = await run_storage(_read_object, file_path)
+    try:
+        variant = await get_image_executor().run("variant", render_variant, data, width, fmt, quality)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"File cannot be transformed: {file_path}")
+    await run_storage(get_storage().save, variant_key, variant.data, variant.content_type)
 
 
 # ── Routes ─────────────────────────────────────────────────────────────────────
 
 @router.get("/media/{file_path:path}")
-async def serve_media(file_path: str):
+async def serve_media(
+    request: Request,
+    file_path: str,
+    w: Optional[int] = Query(None, ge=1, le=10000, description="Target width, snapped to the derivative ladder"),
+    fmt: Optional[str] = Query(None, description="webp or jpeg; negotiated from Accept when omitted"),
+    q: Optional[int] = Query(None, ge=1, le=100, description="Encoder quality"),
+):
     """
     Proxy S3 images through the backend.
     Since Tigris/Railway S3 doesn't support public bucket policies,
     we fetch the object privately and stream it to the client.
     The backend already has correct CORS headers so the browser accepts it.
+
+    The S3 body is passed through in MEDIA_CHUNK_SIZE chunks rather than
+    buffered, and a single `Range: bytes=...` request is forwarded to S3
+    and answered with 206 Partial Content.
+
+    Revalidations (If-None-Match / If-Modified-Since) are answered with a
+    304 from cached object metadata, usually without contacting S3 at all.
+
+    Full responses are copied into the local media disk cache as they
+    stream; later hits are served straight from disk with a FileResponse.
+
+    Passing any of `w`, `fmt` or `q` serves a resized derivative instead
+    (e.g. `?w=640&fmt=webp&q=80`). Derivatives are rendered once, stored
+    next to the original and served like any other object afterwards.
+
+    With MEDIA_DELIVERY=redirect the bytes are not proxied at all: the
+    response is a MEDIA_REDIRECT_STATUS redirect to a presigned S3 URL,
+    signed once per object per MEDIA_PRESIGN_EXPIRES window.
+
+    When S3 keeps failing or timing out, the storage circuit breaker opens:
+    cached objects are still served from the local disk cache and anything
+    else gets an immediate 503 with Retry-After instead of a hung request.
     """
     if not settings.use_s3:
         raise HTTPException(status_code=404, detail="S3 not configured")
 
-    try:
-        s3 = _get_s3_client()
-        obj = s3.get_object(Bucket=settings.S3_BUCKET, Key=file_path)
-        content_type = obj.get("ContentType", "image/jpeg")
-        body = obj["Body"].read()
-
-        return StreamingResponse(
-            io.BytesIO(body),
-            media_type=content_type,
-            headers={
-                # Cache aggressively on the client — images don't change
-                "Cache-Control": "public, max-age=31536000, immutable",
-            },
-        )
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"File not found: {str(e)}")
+    if w is None and fmt is None and q is None:
+        return await _deliver(request, file_path)
+
+    variant_key, negotiated = await _ensure_variant(request, file_path, w, fmt, q)
+    response = await _deliver(request, variant_key)
+    if negotiated:
+        response.headers["Vary"] = "Accept"
+    return response
 
 
 @router.post("/")
 async def upload_file(
     request: Request,
     file: UploadFile = File(...),
-    subfolder: str = "",
+    subfolder: str = "",  # accepted for compatibility; keys are content-addressed
+    db: Session = Depends(get_db),
     _=Depends(require_admin),
 ):
     if file.content_type not in ALLOWED_TYPES:
@@ -157,33 +391,174 @@ async def upload_file(
             detail=f"File type '{file.content_type}' not allowed. Use JPEG, PNG or WebP."
         )
 
-    file_bytes = await file.read()
+    # Spooled to a temp file in chunks; oversized files are rejected as soon
+    # as they cross MAX_FILE_SIZE instead of after being read into memory
+    async with spool_upload(file) as upload:
+        result = await _store_upload(db, upload, file.content_type)
+
+    return JSONResponse(content=result)
+
+
+@router.post("/batch")
+async def upload_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    subfolder: str = "",  # accepted for compatibility; keys are content-addressed
+    db: Session = Depends(get_db),
+    _=Depends(require_admin),
+):
+    """
+    Upload several files in one request (e.g. a project gallery).
+
+    Files are validated and stored concurrently, at most
+    UPLOAD_BATCH_CONCURRENCY at a time. One bad file does not fail the
+    batch: each entry in `results` reports its own success or error, in
+    the order the files were sent.
+    """
+    if len(files) > settings.UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Max is {settings.UPLOAD_BATCH_MAX_FILES} per batch."
+        )
+
+    slots = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+
+    async def store_one(file: UploadFile) -> dict:
+        async with slots:
+            try:
+                if file.content_type not in ALLOWED_TYPES:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File type '{file.content_type}' not allowed. Use JPEG, PNG or WebP."
+                    )
+                async with spool_upload(file) as upload:
+                    result = await _store_upload(db, upload, file.content_type)
+            except HTTPException as e:
+                return {"filename": file.filename, "success": False, "error": e.detail}
+            return {"filename": file.filename, "success": True, **result}
+
+    results = await asyncio.gather(*(store_one(f) for f in files))
+    uploaded = sum(1 for r in results if r["success"])
+
+    return JSONResponse(content={
+        "uploaded": uploaded,
+        "failed": len(results) - uploaded,
+        "results": results,
+    })
+
+
+@router.post("/presign")
+async def presign_upload(request: Request, body: PresignRequest, _=Depends(require_admin)):
+    """
+    Issue a presigned URL so the browser uploads straight to the bucket.
 
-    if len(file_bytes) > settings.MAX_FILE_SIZE:
+    `method=post` returns a form upload (`url` + `fields`, the file goes
+    last) whose policy pins the content type and caps the size at
+    MAX_FILE_SIZE; `method=put` returns a URL signed for exactly `size`
+    bytes of `content_type`. Either way, call `/finalize` with the returned
+    `file_path` once the upload has completed.
+    """
+    if body.content_type not in ALLOWED_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"File too large. Max size is {settings.MAX_FILE_SIZE // (1024 * 1024)}MB."
+            detail=f"File type '{body.content_type}' not allowed. Use JPEG, PNG or WebP."
         )
+    if body.size > settings.MAX_FILE_SIZE:
+        raise file_too_large()
 
-    filename = _safe_filename(file.filename or "upload")
+    storage = get_storage()
+    key = f"{STAGING_PREFIX}{uuid.uuid4().hex}.{EXTENSIONS[body.content_type]}"
+    expires = settings.S3_PRESIGN_UPLOAD_EXPIRES
+    try:
+        if body.method == "post":
+            post = storage.presign_post(key, body.content_type, settings.MAX_FILE_SIZE, expires)
+            upload = {"url": post["url"], "fields": post["fields"]}
+        else:
+            upload = {
+                "url": storage.presign_put(key, body.content_type, body.size, expires),
+                "headers": {"Content-Type": body.content_type},
+            }
+    except StorageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"method": body.method, "file_path": key, "expires_in": expires, **upload}
+
+
+@router.post("/finalize")
+async def finalize_upload(
+    request: Request,
+    body: FinalizeRequest,
+    db: Session = Depends(get_db),
+    _=Depends(require_admin),
+):
+    """
+    Complete a direct upload: verify the staged object with HEAD, move it
+    to its content-addressed key (server-side copy, or nothing if the same
+    file is already stored), register it and build its derivatives.
+    Returns the same payload as a regular upload.
+    """
+    staged_key = body.file_path
+    if not staged_key.startswith(STAGING_PREFIX) or ".." in staged_key:
+        raise HTTPException(status_code=400, detail="Not a direct upload")
 
-    if settings.use_s3:
-        result = _upload_to_s3(file_bytes, filename, subfolder)
-    else:
-        result = _upload_to_local(file_bytes, filename, subfolder)
+    storage = get_storage()
+    try:
+        info = await run_storage(storage.head, staged_key)
+    except ObjectNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found. Did it complete?")
+    except StorageError as e:
+        raise storage_error(e)
+
+    content_type = info.content_type.split(";")[0].strip().lower()
+    if content_type not in ALLOWED_TYPES or info.size > settings.MAX_FILE_SIZE:
+        await run_storage(storage.delete, staged_key)
+        if info.size > settings.MAX_FILE_SIZE:
+            raise file_too_large()
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type '{content_type}' not allowed. Use JPEG, PNG or WebP."
+        )
+
+    # The bytes are fetched once, bucket to worker, to hash the file and
+    # feed the image workers; the browser never sends them through us
+    try:
+        async with spool_stored_object(staged_key) as upload:
+            result = await _store_upload(db, upload, content_type, staged_key=staged_key)
+    except ObjectNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found. Did it complete?")
+    except StorageError as e:
+        raise storage_error(e)
+    finally:
+        try:
+            await run_storage(storage.delete, staged_key)
+        except StorageError:
+            pass  # left for the garbage collector (prefix uploads/)
 
     return JSONResponse(content=result)
 
 
 @router.delete("/{file_path:path}")
-async def delete_file(request: Request, file_path: str, _=Depends(require_admin)):
-    if settings.use_s3:
-        _delete_from_s3(file_path)
-        return {"message": "File deleted from S3"}
+async def delete_file(
+    request: Request,
+    file_path: str,
+    db: Session = Depends(get_db),
+    _=Depends(require_admin),
+):
+    # Uploads are deduplicated, so one object can back several rows
+    references = await run_db(db, count_references, db, file_path)
+    if references:
+        raise HTTPException(
+            status_code=409,
+            detail=f"File is still used by {references} image field(s)"
+        )
 
-    full_path = os.path.join(settings.UPLOAD_DIR, file_path)
-    if os.path.exists(full_path):
-        os.remove(full_path)
-        return {"message": "File deleted"}
+    storage = get_storage()
+    _presign_cache.pop(file_path)
+    try:
+        deleted = await run_storage(storage.delete, file_path)
+    except StorageError as e:
+        raise storage_error(e, status_code=500)
 
-    raise HTTPException(status_code=404, detail="File not found")
\ No newline at end of file
+    if not deleted:
+        raise HTTPException(status_code=404, detail="File not found")
+    return {"message": f"File deleted from {storage.label}"}
\ No newline at end of file
@@ -31,8 +31,26 @@ class Settings(BaseSettings):
     # ── File uploads ───────────────────────────────────────────────────────────
     UPLOAD_DIR: str = "static"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024   # bytes copied per read while spooling uploads
+    UPLOAD_BATCH_MAX_FILES: int = 50
+    UPLOAD_BATCH_CONCURRENCY: int = 4      # files stored in parallel per batch request
     ALLOWED_EXTENSIONS: str = "jpg,jpeg,png,webp"
 
+    # ── Responsive image derivatives ───────────────────────────────────────────
+    # Every uploaded image also gets resized copies at these widths, in each
+    # format, stored next to the original (e.g. projects/abc-640w.webp).
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_DERIVATIVE_WIDTHS: str = "320,640,1280,1920"
+    IMAGE_DERIVATIVE_FORMATS: str = "webp,jpeg"
+    IMAGE_QUALITY: int = 80
+    IMAGE_PLACEHOLDER_SIZE: int = 16  # longest edge of the blurred LQIP, in pixels
+    # Unreferenced objects younger than this are never garbage collected
+    MEDIA_GC_GRACE_HOURS: int = 24
+
+    # ── Image processing pool ──────────────────────────────────────────────────
+    IMAGE_WORKERS: int = 0      # processes for Pillow work; 0 = one per CPU core
+    IMAGE_QUEUE_SIZE: int = 16  # jobs allowed to wait for a free process
+
     # ── Railway S3 Object Storage ──────────────────────────────────────────────
     S3_ENDPOINT: str = "https://t3.storageapi.dev"
     S3_REGION: str = "auto"
@@ -40,10 +58,80 @@ class Settings(BaseSettings):
     S3_ACCESS_KEY: str = "tid_FHEsWFAbUrTbhaIaTr_LNBCeXziybhxqyHuVimv_wkUZuM_wdg"
     S3_SECRET_KEY: str = "tsec_rBO2b02IR9bnKdxikQtv-yAt5AUI_C76EtC5xv20kEyWSFxv7huyZ0W6swvMSTEK4l+eZt"
 
+    # ── S3 client tuning ───────────────────────────────────────────────────────
+    # One boto3 client is shared by the whole process; these size its
+    # connection pool and bound how long a slow endpoint can hold a worker.
+    S3_MAX_POOL_CONNECTIONS: int = 32
+    S3_CONNECT_TIMEOUT: float = 2.0   # seconds
+    S3_READ_TIMEOUT: float = 10.0     # seconds without a byte from S3 before a call fails
+    S3_RETRY_MODE: str = "standard"   # "legacy" | "standard" | "adaptive"
+    S3_MAX_ATTEMPTS: int = 3
+    # Uploads above the threshold are sent as multipart uploads, parts in parallel
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4
+    # Lifetime of presigned direct-upload URLs, in seconds
+    S3_PRESIGN_UPLOAD_EXPIRES: int = 900
+    # Circuit breaker: this many consecutive failed calls (errors, timeouts
+    # or calls slower than S3_BREAKER_SLOW_CALL) make storage fail fast with
+    # 503 for S3_BREAKER_RESET_TIMEOUT seconds, then one trial call decides
+    # whether to close it again. 0 disables the breaker.
+    S3_BREAKER_FAILURE_THRESHOLD: int = 5
+    S3_BREAKER_SLOW_CALL: float = 10.0    # seconds
+    S3_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds
+    # Threads that run blocking storage calls for async handlers. Kept apart
+    # from the shared threadpool (sync routes, DB work) and capped at the
+    # client's connection pool, since a thread without a connection just waits.
+    STORAGE_IO_WORKERS: int = 32
+
+    # ── Media proxy ────────────────────────────────────────────────────────────
+    MEDIA_CHUNK_SIZE: int = 64 * 1024  # bytes per chunk streamed from S3 to the client
+    MEDIA_HEAD_CACHE_TTL: int = 300     # seconds object metadata is reused for 304s
+    MEDIA_HEAD_CACHE_SIZE: int = 4096   # max cached object metadata entries
+    MEDIA_MISS_CACHE_TTL: int = 10      # seconds a not-found key is answered with 404 from memory
+    MEDIA_MISS_CACHE_SIZE: int = 4096
+    # "proxy" streams bytes through the API; "redirect" answers with a
+    # redirect to a presigned S3 GET URL and lets the bucket serve them
+    MEDIA_DELIVERY: str = "proxy"
+    MEDIA_REDIRECT_STATUS: int = 307    # 302 or 307
+    MEDIA_PRESIGN_EXPIRES: int = 3600   # lifetime of presigned GET URLs, in seconds
+    MEDIA_PRESIGN_MARGIN: int = 300     # stop handing out a cached URL this long before it expires
+    MEDIA_PRESIGN_CACHE_SIZE: int = 4096
+
+    # ── Media disk cache ───────────────────────────────────────────────────────
+    # Local LRU copy of proxied S3 objects. Set MEDIA_CACHE_MAX_BYTES=0 to disable.
+    # The budget applies per worker process, not to the shared directory.
+    MEDIA_CACHE_DIR: str = ""  # defaults to <tmp>/entourage-media-cache
+    MEDIA_CACHE_MAX_BYTES: int = 512 * 1024 * 1024       # 512 MB
+    MEDIA_CACHE_MAX_OBJECT_SIZE: int = 25 * 1024 * 1024  # larger objects are never cached
+
+    # ── Public response cache ──────────────────────────────────────────────────
+    # Serialised JSON of the public list endpoints, dropped when a write to
+    # one of their tables commits. Set RESPONSE_CACHE_MAX_BYTES=0 to disable.
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 32 MB
+    RESPONSE_CACHE_TTL: int = 300  # seconds; bounds staleness from writes by other processes
+
+    # ── Pagination ─────────────────────────────────────────────────────────────
+    # Totals are counted exactly up to this many rows (by the PostgreSQL
+    # planner's estimate); above it the estimate is returned instead.
+    PAGINATION_EXACT_COUNT_LIMIT: int = 10000
+
     @property
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
 
+    @property
+    def allowed_extensions_list(self) -> list:
+        return [e.strip().lower() for e in self.ALLOWED_EXTENSIONS.split(",") if e.strip()]
+
+    @property
+    def image_derivative_widths(self) -> list:
+        return sorted(int(w) for w in self.IMAGE_DERIVATIVE_WIDTHS.split(",") if w.strip())
+
+    @property
+    def image_derivative_formats(self) -> list:
+        return [f.strip().lower() for f in self.IMAGE_DERIVATIVE_FORMATS.split(",") if f.strip()]
+
     @property
     def use_s3(self) -> bool:
         return bool(
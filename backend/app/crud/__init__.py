@@ -4,6 +4,7 @@ from app.crud.blog import blog
 from app.crud.contact import contact
 from app.crud.testimonial import testimonial
 from app.crud.social_media import social_media
+from app.crud.media import media_asset
 
 __all__ = [
     "service",
@@ -12,4 +13,5 @@ __all__ = [
     "contact",
     "testimonial",
     "social_media",
+    "media_asset",
 ]
\ No newline at end of file
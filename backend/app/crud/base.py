@@ -1,7 +1,10 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Tuple
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.database import Base
+from app.utils.media import media_keys, sync_image_meta, update_ref_counts
+from app.utils.media_cleanup import get_media_cleanup
+from app.utils.pagination import Page, keyset_page
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -14,6 +17,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     Provides generic Create, Read, Update, Delete methods.
     """
     
+    # Columns get_page() orders and pages by; the last one must be unique
+    sort_keys: Tuple[str, ...] = ("id",)
+    sort_descending: bool = False
+    
     def __init__(self, model: Type[ModelType]):
         """
         Initialize CRUD object with a SQLAlchemy model.
@@ -23,6 +30,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
     
+    def _query(self, db: Session):
+        """
+        Base query for reads. Subclasses override it to add loader options
+        (e.g. eager-loading relationships the response schema includes).
+        """
+        return db.query(self.model)
+    
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """
         Get a single record by ID.
@@ -34,7 +48,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             Model instance or None
         """
-        return db.query(self.model).filter(self.model.id == id).first()
+        return self._query(db).filter(self.model.id == id).first()
     
     def get_by_slug(self, db: Session, slug: str) -> Optional[ModelType]:
         """
@@ -47,7 +61,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             Model instance or None
         """
-        return db.query(self.model).filter(self.model.slug == slug).first()
+        return self._query(db).filter(self.model.slug == slug).first()
     
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
@@ -63,7 +77,42 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             List of model instances
         """
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self._query(db).offset(skip).limit(limit).all()
+    
+    def get_page(
+        self,
+        db: Session,
+        *criteria,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page:
+        """
+        Get one page of records in `sort_keys` order using keyset pagination.
+        
+        Args:
+            db: Database session
+            criteria: Filter expressions
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum number of records to return
+            with_total: Also count the matching records
+            
+        Returns:
+            Page of model instances with the cursor of the next page
+            
+        Raises:
+            HTTPException: 400 if the cursor is invalid
+        """
+        columns = [getattr(self.model, name) for name in self.sort_keys]
+        return keyset_page(
+            db,
+            self._query(db).filter(*criteria),
+            columns,
+            descending=self.sort_descending,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
     
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -78,7 +127,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
+        sync_image_meta(db, db_obj)
         db.add(db_obj)
+        update_ref_counts(db, media_keys(db_obj))
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -106,10 +157,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
         
+        images_changed = bool(set(update_data) & set(getattr(self.model, "__image_fields__", ())))
+        previous_keys = media_keys(db_obj) if images_changed else set()
+        
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
         db.add(db_obj)
+        if images_changed:
+            sync_image_meta(db, db_obj)
+            update_ref_counts(db, previous_keys | media_keys(db_obj))
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -127,6 +184,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = db.query(self.model).get(id)
         if obj:
+            keys = media_keys(obj)
             db.delete(obj)
+            update_ref_counts(db, keys)
             db.commit()
+            # Stored files go in the background, once nothing else uses them
+            get_media_cleanup().enqueue(keys)
         return obj
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
+from app.utils.pagination import Page
 from app.models.blog import BlogPost
 from app.schemas.blog import BlogCreate, BlogUpdate
 
@@ -8,6 +9,9 @@ from app.schemas.blog import BlogCreate, BlogUpdate
 class CRUDBlog(CRUDBase[BlogPost, BlogCreate, BlogUpdate]):
     """CRUD operations for BlogPost model"""
     
+    sort_keys = ("date", "id")
+    sort_descending = True
+    
     def get_by_slug(self, db: Session, slug: str) -> Optional[BlogPost]:
         """Get blog post by slug"""
         return db.query(BlogPost).filter(BlogPost.slug == slug).first()
@@ -22,11 +26,23 @@ class CRUDBlog(CRUDBase[BlogPost, BlogCreate, BlogUpdate]):
     
     def search(self, db: Session, query: str) -> List[BlogPost]:
         """Search blog posts by title or excerpt"""
+        return db.query(BlogPost).filter(self._search_filter(query)).order_by(BlogPost.date.desc()).all()
+    
+    def get_page(
+        self, db: Session, *, category: Optional[str] = None, search: Optional[str] = None, **page
+    ) -> Page:
+        """Get a page of blog posts (newest first), optionally filtered by category and/or search"""
+        criteria = []
+        if category:
+            criteria.append(BlogPost.category == category)
+        if search:
+            criteria.append(self._search_filter(search))
+        return super().get_page(db, *criteria, **page)
+    
+    @staticmethod
+    def _search_filter(query: str):
         search_pattern = f"%{query}%"
-        return db.query(BlogPost).filter(
-            (BlogPost.title.ilike(search_pattern)) | 
-            (BlogPost.excerpt.ilike(search_pattern))
-        ).order_by(BlogPost.date.desc()).all()
+        return (BlogPost.title.ilike(search_pattern)) | (BlogPost.excerpt.ilike(search_pattern))
 
 
 # Create instance
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
+from app.utils.pagination import Page
 from app.models.contact import ContactSubmission
 from app.schemas.contact import ContactCreate, ContactCreate as ContactUpdate
 
@@ -8,6 +9,9 @@ from app.schemas.contact import ContactCreate, ContactCreate as ContactUpdate
 class CRUDContact(CRUDBase[ContactSubmission, ContactCreate, ContactUpdate]):
     """CRUD operations for ContactSubmission model"""
     
+    sort_keys = ("created_at", "id")
+    sort_descending = True
+    
     def get_all_ordered(self, db: Session, skip: int = 0, limit: int = 100) -> List[ContactSubmission]:
         """Get all contact submissions ordered by date (newest first)"""
         return db.query(ContactSubmission).order_by(ContactSubmission.created_at.desc()).offset(skip).limit(limit).all()
@@ -18,6 +22,11 @@ class CRUDContact(CRUDBase[ContactSubmission, ContactCreate, ContactUpdate]):
             ContactSubmission.is_read == False
         ).order_by(ContactSubmission.created_at.desc()).all()
     
+    def get_page(self, db: Session, *, unread_only: bool = False, **page) -> Page:
+        """Get a page of contact submissions (newest first), optionally unread only"""
+        criteria = [ContactSubmission.is_read == False] if unread_only else []
+        return super().get_page(db, *criteria, **page)
+    
     def mark_as_read(self, db: Session, contact_id: int) -> Optional[ContactSubmission]:
         """Mark a contact submission as read"""
         db_contact = db.query(ContactSubmission).filter(ContactSubmission.id == contact_id).first()
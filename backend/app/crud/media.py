@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.crud.base import CRUDBase
+from app.models.media import MediaAsset
+from app.schemas.media import MediaAssetCreate
+
+
+class CRUDMediaAsset(CRUDBase[MediaAsset, MediaAssetCreate, MediaAssetCreate]):
+    """CRUD operations for MediaAsset model"""
+
+    def get_by_key(self, db: Session, *, key: str) -> Optional[MediaAsset]:
+        """Get the asset stored under a storage key"""
+        return db.query(MediaAsset).filter(MediaAsset.key == key).first()
+
+    def get_by_keys(self, db: Session, *, keys: Iterable[str]) -> Dict[str, MediaAsset]:
+        """Get assets for several storage keys in one query, keyed by storage key"""
+        keys = {k for k in keys if k}
+        if not keys:
+            return {}
+        assets = db.query(MediaAsset).filter(MediaAsset.key.in_(keys)).all()
+        return {asset.key: asset for asset in assets}
+
+    def register(self, db: Session, *, obj_in: MediaAssetCreate) -> MediaAsset:
+        """
+        Record an upload. Keys are content-addressed, so registering the
+        same key twice returns the existing row.
+        """
+        existing = self.get_by_key(db, key=obj_in.key)
+        if existing:
+            return existing
+        try:
+            return self.create(db, obj_in=obj_in)
+        except IntegrityError:
+            # A concurrent upload of the same file registered it first
+            db.rollback()
+            return self.get_by_key(db, key=obj_in.key)
+
+
+media_asset = CRUDMediaAsset(MediaAsset)
@@ -1,26 +1,45 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.crud.base import CRUDBase
+from app.utils.pagination import Page
 from app.models.project import Project, ProjectImage
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectImageCreate
+from app.utils.media import media_keys, sync_image_meta, update_ref_counts
+from app.utils.media_cleanup import get_media_cleanup
 
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
+    sort_keys = ("created_at", "id")
+    sort_descending = True
+
+    def _query(self, db: Session):
+        """
+        Projects are always read with their image pairs: one extra
+        SELECT ... WHERE project_id IN (...) for the whole result instead of
+        one lazy load per project when the response is serialised.
+        """
+        return db.query(Project).options(selectinload(Project.images))
+
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Project]:
         """Get a project by its slug"""
-        return db.query(Project).filter(Project.slug == slug).first()
+        return self._query(db).filter(Project.slug == slug).first()
 
     def get_by_category(self, db: Session, *, category: str) -> List[Project]:
         """Get all projects in a category"""
-        return db.query(Project).filter(Project.category == category).all()
+        return self._query(db).filter(Project.category == category).all()
+
+    def get_page(self, db: Session, *, category: Optional[str] = None, **page) -> Page:
+        """Get a page of projects (newest first), optionally in one category"""
+        criteria = [Project.category == category] if category else []
+        return super().get_page(db, *criteria, **page)
 
     def get_all_with_images(self, db: Session) -> List[Project]:
         """Get all projects with their images preloaded"""
-        return db.query(Project).order_by(Project.created_at.desc()).all()
+        return self._query(db).order_by(Project.created_at.desc()).all()
 
     def get_featured(self, db: Session, *, limit: int = 3) -> List[Project]:
         """Get featured projects (limited to specified number)"""
-        return db.query(Project)\
+        return self._query(db)\
             .filter(Project.is_featured == True)\
             .order_by(Project.created_at.desc())\
             .limit(limit)\
@@ -35,7 +54,9 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
             label=image_data.label,
             order_index=image_data.order_index,
         )
+        sync_image_meta(db, db_image)
         db.add(db_image)
+        update_ref_counts(db, media_keys(db_image))
         db.commit()
         db.refresh(db_image)
         return db_image
@@ -44,10 +65,13 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         """Update an image pair"""
         db_image = db.query(ProjectImage).filter(ProjectImage.id == image_id).first()
         if db_image:
+            previous_keys = media_keys(db_image)
             db_image.before_image = image_data.before_image
             db_image.after_image = image_data.after_image
             db_image.label = image_data.label
             db_image.order_index = image_data.order_index
+            sync_image_meta(db, db_image)
+            update_ref_counts(db, previous_keys | media_keys(db_image))
             db.commit()
             db.refresh(db_image)
         return db_image
@@ -56,8 +80,11 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         """Delete an image pair"""
         db_image = db.query(ProjectImage).filter(ProjectImage.id == image_id).first()
         if db_image:
+            keys = media_keys(db_image)
             db.delete(db_image)
+            update_ref_counts(db, keys)
             db.commit()
+            get_media_cleanup().enqueue(keys)
         return db_image
 
 
@@ -1,11 +1,19 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
+from app.utils.pagination import Page
 from app.models.testimonial import Testimonial
 from app.schemas.testimonial import TestimonialCreate, TestimonialUpdate
 
 
 class CRUDTestimonial(CRUDBase[Testimonial, TestimonialCreate, TestimonialUpdate]):
+    sort_keys = ("order_index", "id")
+
+    def get_page(self, db: Session, *, active_only: bool = False, **page) -> Page:
+        """Get a page of testimonials in display order, optionally active only"""
+        criteria = [Testimonial.is_active == True] if active_only else []
+        return super().get_page(db, *criteria, **page)
+
     def get_active(self, db: Session) -> List[Testimonial]:
         """Get all active testimonials"""
         return db.query(Testimonial)\
@@ -1,8 +1,14 @@
+import asyncio
+from typing import Any, Callable
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
+# Key in Session.info holding the lock that serialises run_db() calls
+_SESSION_LOCK = "run_db_lock"
+
 # Create PostgreSQL engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -27,4 +33,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def run_db(db: Session, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking ORM work `fn(*args, **kwargs)` on the threadpool so async
+    endpoints do not stall the event loop on a database round trip.
+
+    Calls for the same session run one at a time: a Session is not
+    thread-safe, and concurrent tasks of one request (e.g. the files of a
+    batch upload) share it.
+    """
+    lock = db.info.get(_SESSION_LOCK)
+    if lock is None:
+        lock = db.info[_SESSION_LOCK] = asyncio.Lock()
+    async with lock:
+        return await run_in_threadpool(fn, *args, **kwargs)
@@ -1,13 +1,17 @@
 import logging
-from fastapi import FastAPI, Request
-from fastapi.responses import Response
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from sqlalchemy import text, inspect
 from app.core.config import settings
 from app.api.v1.router import api_router
+from app.utils.pagination import PAGE_HEADERS
 from app.database import engine, Base
+from app.storage import shutdown_storage_executor
+from app.utils.image_executor import shutdown_image_executor
+from app.utils.media_cleanup import shutdown_media_cleanup
 
 # ── Logging setup ──────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.DEBUG)
@@ -32,6 +36,47 @@ def run_safe_migrations():
             conn.commit()
             print("✅ Migration: added 'image' column to projects table")
 
+        # ── image_meta (placeholder metadata) ──────────────────────────────
+        for table in ("projects", "project_images", "blog_posts", "services"):
+            cols = [c["name"] for c in inspector.get_columns(table)]
+            if "image_meta" not in cols:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN image_meta JSON"))
+                conn.commit()
+                print(f"✅ Migration: added 'image_meta' column to {table} table")
+
+        # ── project_images.updated_at (conditional GET validators) ───────
+        image_cols = [c["name"] for c in inspector.get_columns("project_images")]
+        if "updated_at" not in image_cols:
+            # No default: existing rows fall back to created_at
+            conn.execute(text("ALTER TABLE project_images ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE"))
+            conn.commit()
+            print("✅ Migration: added 'updated_at' column to project_images table")
+
+        # ── media_assets registry columns ──────────────────────────────────
+        if inspector.has_table("media_assets"):
+            asset_cols = [c["name"] for c in inspector.get_columns("media_assets")]
+            for column, ddl in (
+                ("size", "BIGINT"),
+                ("content_type", "VARCHAR(100)"),
+                ("sha256", "VARCHAR(64)"),
+                ("ref_count", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in asset_cols:
+                    conn.execute(text(f"ALTER TABLE media_assets ADD COLUMN {column} {ddl}"))
+                    conn.commit()
+                    print(f"✅ Migration: added '{column}' column to media_assets table")
+
+        # ── Indexes declared after a table was created (keyset sort keys) ──
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn)
+                    conn.commit()
+                    print(f"✅ Migration: created index {index.name}")
+
 run_safe_migrations()
 
 
@@ -84,10 +129,68 @@ class CustomCORSMiddleware(BaseHTTPMiddleware):
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Cookie"
+            response.headers["Access-Control-Expose-Headers"] = ", ".join(("ETag", *PAGE_HEADERS))
 
         return response
 
 
+# ── Upload size limit ──────────────────────────────────────────────────────────
+# Room for multipart boundaries and part headers on top of the file itself
+UPLOAD_BODY_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized upload bodies while they are still arriving.
+
+    `limits` maps path prefixes to body size limits; the first matching
+    prefix wins. Requests announcing a Content-Length over the limit get a
+    413 before any of the body is read; chunked or understated bodies are
+    counted as they stream in and cut off with a 413 as soon as they cross
+    it, so the multipart parser never spools more than the limit to disk.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    def _limit_for(self, path: str):
+        for prefix, limit in self.limits.items():
+            if path.startswith(prefix):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        limit = None
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT"):
+            limit = self._limit_for(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload too large. Max size is {limit // (1024 * 1024)}MB."
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI lets HTTPExceptions raised while parsing the body through
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Entourage AV API",
@@ -97,6 +200,15 @@ app = FastAPI(
     redirect_slashes=False,
 )
 
+# Added first so it sits inside the CORS middleware and 413s carry CORS headers
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/v1/upload/batch": (settings.MAX_FILE_SIZE + UPLOAD_BODY_OVERHEAD) * settings.UPLOAD_BATCH_MAX_FILES,
+        "/api/v1/upload": settings.MAX_FILE_SIZE + UPLOAD_BODY_OVERHEAD,
+    },
+)
+
 app.add_middleware(CustomCORSMiddleware)
 
 app.add_middleware(
@@ -107,6 +219,13 @@ app.add_middleware(
     https_only=settings.is_production,
 )
 
+@app.on_event("shutdown")
+def stop_background_workers():
+    shutdown_image_executor()
+    shutdown_media_cleanup()
+    shutdown_storage_executor()
+
+
 # Mount static files directory
 app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
 
@@ -4,6 +4,7 @@ from app.models.blog import BlogPost
 from app.models.contact import ContactSubmission
 from app.models.testimonial import Testimonial
 from app.models.social_media import SocialMediaLink
+from app.models.media import MediaAsset
 
 __all__ = [
     "Service",
@@ -13,4 +14,5 @@ __all__ = [
     "ContactSubmission",
     "Testimonial",
     "SocialMediaLink",
+    "MediaAsset",
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -7,6 +7,7 @@ class BlogPost(Base):
     """BlogPost model for blog articles"""
     
     __tablename__ = "blog_posts"
+    __image_fields__ = ("image",)
     
     id = Column(Integer, primary_key=True, index=True)
     slug = Column(String(255), unique=True, nullable=False, index=True)
@@ -16,10 +17,16 @@ class BlogPost(Base):
     excerpt = Column(Text, nullable=False)  # Short preview
     content = Column(Text, nullable=True)  # Full article content
     image = Column(String(500), nullable=True)
+    image_meta = Column(JSON, nullable=True)  # placeholder metadata per image field
     author = Column(String(255), nullable=True)
     read_time = Column(String(50), nullable=True)  # "5 min"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Keyset pagination sort key (see CRUDBase.get_page)
+    __table_args__ = (
+        Index('ix_blog_posts_date_id', 'date', 'id'),
+    )
     
     def __repr__(self):
         return f"<BlogPost {self.id}: {self.title}>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -19,6 +19,11 @@ class ContactSubmission(Base):
     message = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    # Keyset pagination sort key (see CRUDBase.get_page)
+    __table_args__ = (
+        Index('ix_contact_submissions_created_at_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f"<ContactSubmission {self.id}: {self.name}>"
\ No newline at end of file
@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class MediaAsset(Base):
+    """Metadata for an uploaded image, keyed by its storage key"""
+
+    __tablename__ = "media_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(500), unique=True, nullable=False, index=True)
+    size = Column(BigInteger, nullable=True)             # bytes
+    content_type = Column(String(100), nullable=True)
+    sha256 = Column(String(64), nullable=True, index=True)
+    width = Column(Integer, nullable=True)               # intrinsic, after EXIF orientation
+    height = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True)            # tiny blurred data URI
+    dominant_color = Column(String(7), nullable=True)    # "#rrggbb"
+    ref_count = Column(Integer, default=0, nullable=False)  # image fields pointing at this key
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def meta(self) -> dict:
+        """Placeholder metadata as stored alongside image references"""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "placeholder": self.placeholder,
+            "dominant_color": self.dominant_color,
+        }
+
+    def __repr__(self):
+        return f"<MediaAsset {self.key}>"
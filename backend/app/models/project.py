@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,6 +6,8 @@ from app.database import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __image_fields__ = ("image", "thumbnail_image")
+    __image_relations__ = ("images",)
 
     id = Column(Integer, primary_key=True, index=True)
     slug = Column(String(255), unique=True, nullable=False, index=True)
@@ -18,11 +20,22 @@ class Project(Base):
     surface = Column(String(100), nullable=True)
     image = Column(String(500), nullable=True)            # hero / cover image
     thumbnail_image = Column(String(500), nullable=True)  # gallery card thumbnail
+    image_meta = Column(JSON, nullable=True)              # placeholder metadata per image field
     is_featured = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    images = relationship("ProjectImage", back_populates="project", cascade="all, delete-orphan")
+    # Keyset pagination sort key (see CRUDBase.get_page)
+    __table_args__ = (
+        Index('ix_projects_created_at_id', 'created_at', 'id'),
+    )
+
+    images = relationship(
+        "ProjectImage",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        order_by="(ProjectImage.order_index, ProjectImage.id)",
+    )
 
     def __repr__(self):
         return f"<Project {self.number}: {self.title}>"
@@ -30,6 +43,7 @@ class Project(Base):
 
 class ProjectImage(Base):
     __tablename__ = "project_images"
+    __image_fields__ = ("before_image", "after_image")
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -37,7 +51,9 @@ class ProjectImage(Base):
     after_image = Column(String(500), nullable=False)
     label = Column(String(255), nullable=True)
     order_index = Column(Integer, default=0, index=True)
+    image_meta = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     project = relationship("Project", back_populates="images")
 
@@ -7,6 +7,7 @@ class Service(Base):
     """Service model for renovation services"""
     
     __tablename__ = "services"
+    __image_fields__ = ("image",)
     
     id = Column(Integer, primary_key=True, index=True)
     number = Column(String(10), nullable=False)  # "01", "02"
@@ -15,6 +16,7 @@ class Service(Base):
     description = Column(Text, nullable=False)
     long_description = Column(Text, nullable=True)
     image = Column(String(500), nullable=True)
+    image_meta = Column(JSON, nullable=True)  # placeholder metadata per image field
     timeline = Column(String(100), nullable=True)  # "2-6 semaines"
     benefits = Column(JSON, nullable=True)  # Array of benefits
     created_at = Column(DateTime(timezone=True), server_default=func.now())
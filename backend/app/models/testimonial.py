@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -14,11 +14,16 @@ class Testimonial(Base):
     text = Column(Text, nullable=False)  # Testimonial content
     rating = Column(Integer, default=5)  # 1-5 stars
     project = Column(String(255), nullable=True)  # "Rénovation Complète"
-    order_index = Column(Integer, default=0, index=True)  # Display order
+    order_index = Column(Integer, nullable=False, default=0, server_default="0", index=True)  # Display order (keyset sort key: never NULL)
     is_active = Column(Boolean, default=True, index=True)  # Show/hide
     is_featured = Column(Boolean, default=False)  # ✅ New field for featured testimonials
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Keyset pagination sort key (see CRUDBase.get_page)
+    __table_args__ = (
+        Index('ix_testimonials_order_index_id', 'order_index', 'id'),
+    )
     
     def __repr__(self):
         return f"<Testimonial {self.id}: {self.name}>"
\ No newline at end of file
@@ -10,7 +10,10 @@ from app.schemas.blog import BlogCreate, BlogUpdate, BlogResponse
 from app.schemas.contact import ContactCreate, ContactResponse
 from app.schemas.testimonial import TestimonialCreate, TestimonialUpdate, TestimonialResponse
 from app.schemas.social_media import SocialMediaCreate, SocialMediaUpdate, SocialMediaResponse
+from app.schemas.media import ImageMeta, MediaAssetCreate
+from app.schemas.upload import PresignRequest, FinalizeRequest
 from app.schemas.auth import LoginRequest, LoginResponse, CheckAuthResponse
+from app.schemas.site import SiteBundleResponse
 
 __all__ = [
     # Service
@@ -38,8 +41,16 @@ __all__ = [
     "SocialMediaCreate",
     "SocialMediaUpdate",
     "SocialMediaResponse",
+    # Media
+    "ImageMeta",
+    "MediaAssetCreate",
+    # Upload
+    "PresignRequest",
+    "FinalizeRequest",
     # Auth
     "LoginRequest",
     "LoginResponse",
     "CheckAuthResponse",
+    # Site
+    "SiteBundleResponse",
 ]
\ No newline at end of file
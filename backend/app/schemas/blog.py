@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime, date
+from app.schemas.media import ImageMeta
 
 
 class BlogBase(BaseModel):
@@ -37,6 +38,7 @@ class BlogUpdate(BaseModel):
 class BlogResponse(BlogBase):
     """Schema for blog post response"""
     id: int
+    image_meta: Optional[Dict[str, ImageMeta]] = None  # keyed by image field
     created_at: datetime
     updated_at: datetime
     
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class ImageMeta(BaseModel):
+    """Placeholder metadata returned inline with an image reference"""
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None       # blurred base64 data URI
+    dominant_color: Optional[str] = None    # "#rrggbb"
+
+
+class MediaAssetCreate(ImageMeta):
+    """Schema for registering an uploaded image"""
+    key: str = Field(..., max_length=500)
+    size: Optional[int] = None
+    content_type: Optional[str] = Field(None, max_length=100)
+    sha256: Optional[str] = Field(None, max_length=64)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
+from app.schemas.media import ImageMeta
 
 
 class ProjectImageBase(BaseModel):
@@ -17,6 +18,7 @@ class ProjectImageCreate(ProjectImageBase):
 class ProjectImageResponse(ProjectImageBase):
     id: int
     project_id: int
+    image_meta: Optional[Dict[str, ImageMeta]] = None  # keyed by image field
     created_at: datetime
 
     class Config:
@@ -57,6 +59,7 @@ class ProjectUpdate(BaseModel):
 
 class ProjectResponse(ProjectBase):
     id: int
+    image_meta: Optional[Dict[str, ImageMeta]] = None  # keyed by image field
     images: List[ProjectImageResponse] = []
     created_at: datetime
     updated_at: datetime
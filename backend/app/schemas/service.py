@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
+from app.schemas.media import ImageMeta
 
 
 class ServiceBase(BaseModel):
@@ -35,6 +36,7 @@ class ServiceUpdate(BaseModel):
 class ServiceResponse(ServiceBase):
     """Schema for service response"""
     id: int
+    image_meta: Optional[Dict[str, ImageMeta]] = None  # keyed by image field
     created_at: datetime
     updated_at: datetime
     
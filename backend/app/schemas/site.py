@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemas.blog import BlogResponse
+from app.schemas.project import ProjectResponse
+from app.schemas.service import ServiceResponse
+from app.schemas.social_media import SocialMediaResponse
+from app.schemas.testimonial import TestimonialResponse
+
+
+class SiteBundleResponse(BaseModel):
+    """Schema for everything the public homepage renders, in one response"""
+    featured_projects: List[ProjectResponse]
+    featured_testimonials: List[TestimonialResponse]
+    services: List[ServiceResponse]
+    social_links: List[SocialMediaResponse]
+    blog_posts: List[BlogResponse]
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime
 
@@ -27,10 +27,18 @@ class TestimonialUpdate(BaseModel):
     text: Optional[str] = None
     rating: Optional[int] = Field(None, ge=1, le=5)
     project: Optional[str] = Field(None, max_length=255)
-    order_index: Optional[int] = None
+    order_index: Optional[int] = None  # May be omitted but not null (NOT NULL sort key)
     is_active: Optional[bool] = None
     is_featured: Optional[bool] = None  # ✅ New field
 
+    @field_validator("order_index")
+    @classmethod
+    def order_index_not_null(cls, value: Optional[int]) -> int:
+        """Reject an explicit null; omitting the field leaves the order as is."""
+        if value is None:
+            raise ValueError("order_index may not be null")
+        return value
+
 
 class TestimonialResponse(TestimonialBase):
     """Schema for testimonial response"""
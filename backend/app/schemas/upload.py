@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+
+
+class PresignRequest(BaseModel):
+    """Schema for requesting a direct-to-S3 upload URL"""
+    content_type: str = Field(..., max_length=100)
+    size: int = Field(..., gt=0)                 # bytes the browser is about to send
+    method: Literal["post", "put"] = "post"     # presigned form POST or plain PUT
+
+
+class FinalizeRequest(BaseModel):
+    """Schema for finalizing a direct upload"""
+    file_path: str = Field(..., max_length=500)  # staging key returned by /presign
@@ -0,0 +1,66 @@
+import threading
+from typing import Optional
+from app.core.config import settings
+from app.storage.base import (
+    StorageBackend,
+    StorageError,
+    ObjectNotFound,
+    InvalidRange,
+    StorageUnavailable,
+    ObjectInfo,
+    StoredObject,
+)
+from app.storage.breaker import CircuitBreaker
+from app.storage.disk_cache import MediaDiskCache, get_media_cache
+from app.storage.executor import (
+    StorageExecutor, get_storage_executor, run_storage, shutdown_storage_executor,
+)
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage, get_s3_client, reset_s3_client
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+    """
+    Return the process-wide storage backend.
+    S3 when credentials are configured, otherwise the local static/ directory.
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = S3Storage() if settings.use_s3 else LocalStorage()
+    return _storage
+
+
+def set_storage(storage: Optional[StorageBackend]) -> None:
+    """Override the storage backend (tests, scripts). Pass None to reset."""
+    global _storage
+    with _storage_lock:
+        _storage = storage
+
+
+__all__ = [
+    "StorageBackend",
+    "StorageError",
+    "ObjectNotFound",
+    "InvalidRange",
+    "StorageUnavailable",
+    "ObjectInfo",
+    "StoredObject",
+    "LocalStorage",
+    "S3Storage",
+    "CircuitBreaker",
+    "MediaDiskCache",
+    "get_media_cache",
+    "StorageExecutor",
+    "get_storage_executor",
+    "run_storage",
+    "shutdown_storage_executor",
+    "get_storage",
+    "set_storage",
+    "get_s3_client",
+    "reset_s3_client",
+]
@@ -0,0 +1,292 @@
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+# Only single byte ranges are supported: "bytes=0-499", "bytes=500-", "bytes=-500"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class StorageError(Exception):
+    """Raised when the storage backend fails to complete an operation."""
+
+
+class ObjectNotFound(StorageError):
+    """Raised when the requested key does not exist in the backend."""
+
+
+class InvalidRange(StorageError):
+    """Raised when a requested byte range cannot be satisfied (HTTP 416)."""
+
+
+class StorageUnavailable(StorageError):
+    """Raised without contacting the backend while its circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class ObjectInfo:
+    """Metadata for a stored object, as returned by a HEAD request."""
+    key: str
+    size: int
+    content_type: str
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+@dataclass
+class StoredObject:
+    """An object read back from storage, with its body still open."""
+    key: str
+    body: BinaryIO
+    content_type: str
+    content_length: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+    content_range: Optional[str] = None  # set when only part of the object was returned
+
+    @property
+    def info(self) -> Optional[ObjectInfo]:
+        """Metadata of the whole object, or None for a partial (ranged) read."""
+        if self.content_range or self.content_length is None:
+            return None
+        return ObjectInfo(
+            key=self.key,
+            size=self.content_length,
+            content_type=self.content_type,
+            etag=self.etag,
+            last_modified=self.last_modified,
+        )
+
+    def iter_chunks(self, chunk_size: int):
+        """Yield the body in chunks, closing it once exhausted or abandoned."""
+        try:
+            while True:
+                chunk = self.body.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.body.close()
+
+
+def is_byte_range(header: Optional[str]) -> bool:
+    """True if `header` is a single byte range we know how to serve."""
+    match = _RANGE_RE.match(header.strip()) if header else None
+    return bool(match and (match.group(1) or match.group(2)))
+
+
+def parse_byte_range(header: str, size: int) -> Tuple[int, int]:
+    """
+    Resolve a single-range Range header against an object size.
+
+    Returns:
+        Inclusive (start, end) byte offsets
+
+    Raises:
+        InvalidRange: If the range lies entirely outside the object
+    """
+    start, end = _RANGE_RE.match(header.strip()).groups()
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0 or size == 0:
+            raise InvalidRange(header)
+        return max(size - length, 0), size - 1
+
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        raise InvalidRange(header)
+    return first, last
+
+
+class _RangeReader:
+    """File wrapper that stops reading after `length` bytes."""
+
+    def __init__(self, f, start: int, length: int):
+        f.seek(start)
+        self._f = f
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def open_file(path: str, info: ObjectInfo, byte_range: Optional[str] = None) -> StoredObject:
+    """Open a file on local disk as a StoredObject, resolving `byte_range` against it."""
+    obj = StoredObject(
+        key=info.key,
+        body=open(path, "rb"),
+        content_type=info.content_type,
+        content_length=info.size,
+        etag=info.etag,
+        last_modified=info.last_modified,
+    )
+
+    if is_byte_range(byte_range):
+        try:
+            start, end = parse_byte_range(byte_range, info.size)
+        except Exception:
+            obj.body.close()
+            raise
+        obj.body = _RangeReader(obj.body, start, end - start + 1)
+        obj.content_length = end - start + 1
+        obj.content_range = f"bytes {start}-{end}/{info.size}"
+    return obj
+
+
+class StorageBackend(ABC):
+    """
+    Common interface for media storage.
+    Keys are always forward-slash paths relative to the storage root,
+    e.g. "projects/3f2a9c1d.jpg".
+    """
+
+    #: Human readable name used in upload responses ("Railway S3", "local disk")
+    label: str = ""
+
+    #: Circuit breaker guarding calls to a remote backend (None for local disk)
+    breaker = None
+
+    def __init__(self):
+        # Objects are effectively immutable (unique keys), so HEAD results
+        # can be reused for conditional GETs without asking the backend again.
+        self._head_cache = TTLCache(
+            maxsize=settings.MEDIA_HEAD_CACHE_SIZE,
+            ttl=settings.MEDIA_HEAD_CACHE_TTL,
+        )
+        # Keys that were just looked up and not found. Kept briefly, so a
+        # burst of requests for a missing or mistyped key costs one HEAD;
+        # writes through this backend clear the entry straight away.
+        self._miss_cache = TTLCache(
+            maxsize=settings.MEDIA_MISS_CACHE_SIZE,
+            ttl=settings.MEDIA_MISS_CACHE_TTL,
+        )
+
+    @abstractmethod
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        """Store `data` under `key`, overwriting any existing object."""
+
+    @abstractmethod
+    def save_file(self, key: str, path: str, content_type: str) -> None:
+        """Store the file at `path` under `key` without loading it into memory."""
+
+    @abstractmethod
+    def copy(self, src_key: str, dst_key: str, content_type: str) -> None:
+        """
+        Copy an object inside the store, without passing its bytes through us.
+
+        Raises:
+            ObjectNotFound: If `src_key` does not exist
+        """
+
+    def presign_post(self, key: str, content_type: str, max_size: int, expires: int) -> dict:
+        """
+        Presigned browser form upload to `key`, restricted to `content_type`
+        and at most `max_size` bytes. Returns {"url": ..., "fields": {...}}.
+        """
+        raise StorageError(f"{self.label} does not support direct uploads")
+
+    def presign_put(self, key: str, content_type: str, size: int, expires: int) -> str:
+        """Presigned PUT URL for exactly `size` bytes of `content_type` at `key`."""
+        raise StorageError(f"{self.label} does not support direct uploads")
+
+    def presign_get(self, key: str, expires: int) -> str:
+        """Presigned GET URL for `key`, valid for `expires` seconds."""
+        raise StorageError(f"{self.label} does not support presigned downloads")
+
+    @abstractmethod
+    def open(self, key: str, byte_range: Optional[str] = None) -> StoredObject:
+        """
+        Open an object for reading, optionally limited to a `Range` header value.
+        Range headers that are not a single byte range are ignored.
+
+        Raises:
+            ObjectNotFound: If the key does not exist
+            InvalidRange: If the range cannot be satisfied
+        """
+
+    @abstractmethod
+    def head(self, key: str) -> ObjectInfo:
+        """
+        Fetch object metadata without its body.
+
+        Raises:
+            ObjectNotFound: If the key does not exist
+        """
+
+    def stat(self, key: str) -> ObjectInfo:
+        """
+        `head()` answered from the in-process metadata cache when possible.
+        Not-found results are cached too, for MEDIA_MISS_CACHE_TTL seconds.
+
+        Raises:
+            ObjectNotFound: If the key does not exist
+        """
+        info = self._head_cache.get(key)
+        if info is None:
+            if self._miss_cache.get(key):
+                raise ObjectNotFound(key)
+            try:
+                info = self.head(key)
+            except ObjectNotFound:
+                self._miss_cache.set(key, True)
+                raise
+            self._head_cache.set(key, info)
+        return info
+
+    def remember(self, info: ObjectInfo) -> None:
+        """Seed the metadata cache, e.g. from a full GET that already returned it."""
+        self._head_cache.set(info.key, info)
+
+    def forget(self, key: str) -> None:
+        """Drop cached metadata after the object was written, overwritten or deleted."""
+        self._head_cache.pop(key)
+        self._miss_cache.pop(key)
+
+    @property
+    def available(self) -> bool:
+        """False while the circuit breaker is rejecting calls."""
+        return self.breaker is None or not self.breaker.is_open()
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete an object. Returns False if it did not exist."""
+
+    def delete_many(self, keys: Iterable[str]) -> List[str]:
+        """Delete several objects. Returns the keys that could not be deleted."""
+        failed = []
+        for key in keys:
+            try:
+                self.delete(key)
+            except StorageError:
+                failed.append(key)
+        return failed
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> Iterator[ObjectInfo]:
+        """Iterate over every object whose key starts with `prefix`."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL the frontend should use to display the object."""
+
+    def full_url(self, key: str) -> str:
+        """Absolute version of `url()`."""
+        return self.url(key)
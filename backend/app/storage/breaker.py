@@ -0,0 +1,160 @@
+import functools
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+from app.storage.base import InvalidRange, ObjectNotFound, StorageError, StorageUnavailable
+
+logger = logging.getLogger("entourage.storage")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a storage backend is erroring or slow.
+
+    Closed: calls go through. `failure_threshold` consecutive failures,
+    where a call slower than `slow_call` seconds also counts as a failure
+    (uploads excepted, see `guarded`), open the breaker. Open: calls are rejected at once with
+    StorageUnavailable for `reset_timeout` seconds. Half-open: one trial
+    call is let through. If it succeeds the breaker closes; if it fails the
+    breaker opens again.
+
+    "Not found" and "invalid range" answers are successes. The backend
+    responded; the object just isn't there.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, slow_call: float, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call = slow_call
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+        self.last_transition: Optional[float] = None  # wall clock, for metrics
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _move(self, state: str) -> None:
+        """Change state and count the transition. Caller holds the lock."""
+        name = f"{self.state}->{state}"
+        self.transitions[name] = self.transitions.get(name, 0) + 1
+        self.last_transition = time.time()
+        log = logger.info if state == CLOSED else logger.warning
+        log(f"{self.name} circuit breaker {name}")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+
+    def retry_after(self) -> int:
+        """Whole seconds until the breaker lets a trial call through."""
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        return max(1, math.ceil(remaining))
+
+    def is_open(self) -> bool:
+        """Whether calls would currently be rejected without contacting the backend."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at < self.reset_timeout
+            return self.state == HALF_OPEN and self._trial_running
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            StorageUnavailable: If the breaker is open (or half-open with a
+                trial call already running)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._move(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            if self.state != CLOSED:
+                self.rejected += 1
+                raise StorageUnavailable(
+                    f"{self.name} is unavailable, retry later",
+                    retry_after=self.retry_after() if self.state == OPEN else 1,
+                )
+
+    def record(self, ok: bool, elapsed: float, timed: bool = True) -> None:
+        """
+        Report the outcome of an admitted call.
+
+        Args:
+            ok: Whether the call succeeded
+            elapsed: How long the call took, in seconds
+            timed: Whether a call slower than `slow_call` counts as a failure.
+                False for transfers whose duration grows with the payload.
+        """
+        if not self.enabled:
+            return
+        ok = ok and (not timed or elapsed <= self.slow_call)
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_running = False
+                self._failures = 0 if ok else self.failure_threshold
+                self._move(CLOSED if ok else OPEN)
+            elif ok:
+                self._failures = 0
+            else:
+                self._failures += 1
+                if self.state == CLOSED and self._failures >= self.failure_threshold:
+                    self._move(OPEN)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+                "last_transition": self.last_transition,
+            }
+
+
+def guarded(method: Optional[Callable] = None, *, timed: bool = True) -> Callable:
+    """
+    Run a storage backend method through the backend's `breaker`, if it has
+    one. StorageErrors count as failures, except ObjectNotFound and
+    InvalidRange; other exceptions are bugs, not backend trouble, and do not.
+
+    Use `@guarded(timed=False)` for uploads: a large file on a slow link
+    takes long without the backend being unhealthy, so only errors count.
+    """
+    if method is None:
+        return functools.partial(guarded, timed=timed)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        breaker: Optional[CircuitBreaker] = getattr(self, "breaker", None)
+        if breaker is None:
+            return method(self, *args, **kwargs)
+        breaker.before_call()
+        started = time.monotonic()
+        ok = True
+        try:
+            return method(self, *args, **kwargs)
+        except (ObjectNotFound, InvalidRange):
+            raise
+        except StorageError:
+            ok = False
+            raise
+        finally:
+            breaker.record(ok, time.monotonic() - started, timed=timed)
+    return wrapper
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from app.core.config import settings
+from app.storage.base import ObjectInfo, StoredObject, open_file
+
+logger = logging.getLogger("entourage.media_cache")
+
+
+class MediaDiskCache:
+    """
+    Bounded LRU cache of proxied objects on local disk.
+
+    Each object is stored as two files named after a hash of its key:
+    `<hash>.bin` (the bytes) and `<hash>.json` (its ObjectInfo). Both are
+    written to a temp file and renamed into place, data first, so a reader
+    that finds the metadata file can rely on the data file being complete.
+    That makes the directory safe to share between uvicorn workers.
+
+    The byte budget is per process, not per directory: each worker keeps
+    its own LRU index of what it loaded at startup or wrote since, and
+    only evicts from that. N workers sharing a directory can therefore
+    hold up to N x `max_bytes` on disk; divide MEDIA_CACHE_MAX_BYTES by
+    the worker count when running more than one.
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_object_size: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_object_size = max_object_size
+        self._index: "OrderedDict[str, ObjectInfo]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        self._load_index()
+
+    # ── Paths ──────────────────────────────────────────────────────────────────
+
+    def _base(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def data_path(self, key: str) -> str:
+        return self._base(key) + ".bin"
+
+    def _meta_path(self, key: str) -> str:
+        return self._base(key) + ".json"
+
+    # ── Index ──────────────────────────────────────────────────────────────────
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from disk, least recently written first."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".json"):
+                    continue
+                info = self._read_meta(os.path.join(dirpath, name))
+                if info is None:
+                    continue
+                try:
+                    mtime = os.path.getmtime(self.data_path(info.key))
+                except OSError:
+                    continue
+                entries.append((mtime, info))
+
+        for _, info in sorted(entries, key=lambda e: e[0]):
+            self._index[info.key] = info
+            self._bytes += info.size
+        self._evict()
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[ObjectInfo]:
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return ObjectInfo(
+            key=meta["key"],
+            size=meta["size"],
+            content_type=meta["content_type"],
+            etag=meta.get("etag"),
+            last_modified=datetime.fromisoformat(meta["last_modified"]) if meta.get("last_modified") else None,
+        )
+
+    def _remove_files(self, key: str) -> None:
+        # Metadata first: once it is gone no reader will trust the data file
+        for path in (self._meta_path(key), self.data_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _forget(self, key: str) -> None:
+        """Drop `key` from the index, leaving its files alone. Caller holds the lock."""
+        info = self._index.pop(key, None)
+        if info is not None:
+            self._bytes -= info.size
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until we are within budget. Caller holds the lock."""
+        while self._bytes > self.max_bytes and self._index:
+            key, info = self._index.popitem(last=False)
+            self._bytes -= info.size
+            self._remove_files(key)
+            self.evictions += 1
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[ObjectInfo]:
+        """Return cached metadata for `key` (and mark it recently used), or None."""
+        with self._lock:
+            info = self._index.get(key)
+            if info is not None and not os.path.exists(self.data_path(key)):
+                # Evicted by another worker; drop it here too so it is refilled
+                self._forget(key)
+                info = None
+            if info is not None:
+                self._index.move_to_end(key)
+            else:
+                # Another worker may have cached it since we built our index
+                info = self._read_meta(self._meta_path(key))
+                if info is not None and os.path.exists(self.data_path(key)):
+                    self._index[key] = info
+                    self._bytes += info.size
+                    self._evict()
+                else:
+                    info = None
+
+            if info is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return info
+
+    def open(self, info: ObjectInfo, byte_range: Optional[str] = None) -> StoredObject:
+        """Open a cached object for (optionally ranged) reading."""
+        return open_file(self.data_path(info.key), info, byte_range)
+
+    def accepts(self, info: Optional[ObjectInfo]) -> bool:
+        return info is not None and info.size <= min(self.max_object_size, self.max_bytes)
+
+    def tee(self, info: ObjectInfo, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass `chunks` through unchanged while writing them to the cache.
+        The entry is only published if the whole body was received, so a
+        client disconnect or upstream error never leaves a truncated file.
+        """
+        data_path = self.data_path(info.key)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(data_path), suffix=".tmp")
+        written = 0
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                    written += len(chunk)
+                    yield chunk
+            complete = written == info.size
+        finally:
+            if complete:
+                self._publish(info, tmp_path)
+            else:
+                try:
+                    os.remove(tmp_path)
+                except FileNotFoundError:
+                    pass
+
+    def _publish(self, info: ObjectInfo, tmp_path: str) -> None:
+        try:
+            os.replace(tmp_path, self.data_path(info.key))
+            meta = {
+                "key": info.key,
+                "size": info.size,
+                "content_type": info.content_type,
+                "etag": info.etag,
+                "last_modified": info.last_modified.isoformat() if info.last_modified else None,
+            }
+            meta_dir = os.path.dirname(self._meta_path(info.key))
+            fd, meta_tmp = tempfile.mkstemp(dir=meta_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(meta, f)
+            os.replace(meta_tmp, self._meta_path(info.key))
+        except OSError as e:
+            logger.warning(f"Media cache write failed for {info.key}: {e}")
+            return
+
+        with self._lock:
+            previous = self._index.pop(info.key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._index[info.key] = info
+            self._bytes += info.size
+            self._evict()
+
+    def forget(self, key: str) -> None:
+        """
+        Drop an index entry whose files another worker has removed, so the
+        next response for `key` fills the cache again.
+        """
+        with self._lock:
+            self._forget(key)
+
+    def discard(self, key: str) -> None:
+        """Remove a key, e.g. after the object was deleted or replaced."""
+        with self._lock:
+            self._forget(key)
+            self._remove_files(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[MediaDiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_media_cache() -> Optional[MediaDiskCache]:
+    """Return the process-wide media cache, or None if MEDIA_CACHE_MAX_BYTES is 0."""
+    global _cache
+    if settings.MEDIA_CACHE_MAX_BYTES <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                root = settings.MEDIA_CACHE_DIR or os.path.join(tempfile.gettempdir(), "entourage-media-cache")
+                _cache = MediaDiskCache(
+                    root,
+                    max_bytes=settings.MEDIA_CACHE_MAX_BYTES,
+                    max_object_size=settings.MEDIA_CACHE_MAX_OBJECT_SIZE,
+                )
+    return _cache
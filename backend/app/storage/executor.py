@@ -0,0 +1,97 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+from app.core.config import settings
+
+_DONE = object()
+
+
+class StorageExecutor:
+    """
+    Dedicated thread pool for blocking storage calls (boto3 HEAD/GET/PUT,
+    streaming S3 bodies, local file I/O) made from async handlers.
+
+    boto3 has no async API, so every call must leave the event loop. Using
+    a pool of our own rather than the shared AnyIO threadpool means slow S3
+    round trips cannot starve sync routes and DB work of threads (and vice
+    versa), and the number of calls in flight is bounded by `workers`.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-io")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+
+    def _call(self, fn: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` in the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(self._call, fn, *args, **kwargs))
+
+    async def iterate(self, iterator: Iterator) -> AsyncIterator:
+        """
+        Drain a blocking iterator (e.g. an S3 body's chunks) one item per
+        pool call. The iterator is closed when the consumer stops early.
+        """
+        try:
+            while True:
+                item = await self.run(next, iterator, _DONE)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self.run(close)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[StorageExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_storage_executor() -> StorageExecutor:
+    """Return the process-wide storage I/O pool."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = StorageExecutor(
+                    workers=max(1, min(settings.STORAGE_IO_WORKERS, settings.S3_MAX_POOL_CONNECTIONS)),
+                )
+    return _executor
+
+
+async def run_storage(fn: Callable, *args, **kwargs) -> Any:
+    """Shorthand for `get_storage_executor().run(...)`."""
+    return await get_storage_executor().run(fn, *args, **kwargs)
+
+
+def shutdown_storage_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
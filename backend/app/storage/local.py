@@ -0,0 +1,98 @@
+import hashlib
+import mimetypes
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from app.core.config import settings
+from app.storage.base import (
+    StorageBackend,
+    ObjectNotFound,
+    ObjectInfo,
+    StoredObject,
+    open_file,
+)
+
+
+class LocalStorage(StorageBackend):
+    """Objects stored under UPLOAD_DIR and served by the /static mount (development)."""
+
+    label = "local disk"
+
+    def __init__(self, root: Optional[str] = None):
+        super().__init__()
+        self.root = root or settings.UPLOAD_DIR
+
+    def path(self, key: str) -> str:
+        """Filesystem path for a key, refusing anything that escapes the root."""
+        root = os.path.abspath(self.root)
+        full_path = os.path.abspath(os.path.join(root, key))
+        if full_path != root and not full_path.startswith(root + os.sep):
+            raise ObjectNotFound(key)
+        return full_path
+
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        self.forget(key)
+        full_path = self.path(key)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(data)
+
+    def save_file(self, key: str, path: str, content_type: str) -> None:
+        self.forget(key)
+        full_path = self.path(key)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        shutil.copyfile(path, full_path)
+
+    def copy(self, src_key: str, dst_key: str, content_type: str) -> None:
+        src_path = self.path(src_key)
+        if not os.path.isfile(src_path):
+            raise ObjectNotFound(src_key)
+        self.forget(dst_key)
+        dst_path = self.path(dst_key)
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        shutil.copyfile(src_path, dst_path)
+
+    def head(self, key: str) -> ObjectInfo:
+        full_path = self.path(key)
+        if not os.path.isfile(full_path):
+            raise ObjectNotFound(key)
+
+        stat = os.stat(full_path)
+        # Same validator scheme as Starlette's FileResponse
+        etag = hashlib.md5(f"{stat.st_mtime}-{stat.st_size}".encode()).hexdigest()
+        return ObjectInfo(
+            key=key,
+            size=stat.st_size,
+            content_type=mimetypes.guess_type(full_path)[0] or "image/jpeg",
+            etag=f'"{etag}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        )
+
+    def open(self, key: str, byte_range: Optional[str] = None) -> StoredObject:
+        return open_file(self.path(key), self.head(key), byte_range)
+
+    def delete(self, key: str) -> bool:
+        self.forget(key)
+        full_path = self.path(key)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+            return True
+        return False
+
+    def list(self, prefix: str = "") -> Iterator[ObjectInfo]:
+        root = os.path.abspath(self.root)
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                key = os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    try:
+                        yield self.head(key)
+                    except ObjectNotFound:
+                        continue  # removed while we were walking
+
+    def url(self, key: str) -> str:
+        return f"/static/{key}"
+
+    def full_url(self, key: str) -> str:
+        return f"http://localhost:8000{self.url(key)}"
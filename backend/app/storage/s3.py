@@ -0,0 +1,317 @@
+import mimetypes
+import threading
+from typing import Any, Iterable, Iterator, List, Optional
+from app.core.config import settings
+from app.storage.base import (
+    StorageBackend,
+    StorageError,
+    ObjectNotFound,
+    InvalidRange,
+    ObjectInfo,
+    StoredObject,
+    is_byte_range,
+)
+from app.storage.breaker import CircuitBreaker, guarded
+from app.storage.disk_cache import get_media_cache
+
+# delete_objects accepts at most 1000 keys per call
+DELETE_BATCH_SIZE = 1000
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Return the process-wide boto3 S3 client, creating it on first use.
+
+    boto3 clients are thread-safe once built but building one is not, and it
+    is expensive (credential and endpoint resolution, a fresh connection
+    pool). We build exactly one and share its pool across all requests.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError:
+                raise StorageError("boto3 not installed. Add 'boto3' to requirements.txt")
+
+            _client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                region_name=settings.S3_REGION,
+                config=Config(
+                    signature_version="s3v4",
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                    read_timeout=settings.S3_READ_TIMEOUT,
+                    retries={
+                        "mode": settings.S3_RETRY_MODE,
+                        "max_attempts": settings.S3_MAX_ATTEMPTS,
+                    },
+                ),
+            )
+    return _client
+
+
+def reset_s3_client() -> None:
+    """Drop the shared client so the next call rebuilds it (tests, settings changes)."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def _error_code(exc: Exception) -> str:
+    return getattr(exc, "response", {}).get("Error", {}).get("Code", "")
+
+
+def _is_not_found(exc: Exception) -> bool:
+    return _error_code(exc) in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(StorageBackend):
+    """Objects stored in the Railway (Tigris) S3 bucket, served through our media proxy."""
+
+    label = "Railway S3"
+
+    def __init__(self, bucket: Optional[str] = None):
+        super().__init__()
+        self.bucket = bucket or settings.S3_BUCKET
+        self.breaker = CircuitBreaker(
+            self.label,
+            failure_threshold=settings.S3_BREAKER_FAILURE_THRESHOLD,
+            slow_call=settings.S3_BREAKER_SLOW_CALL,
+            reset_timeout=settings.S3_BREAKER_RESET_TIMEOUT,
+        )
+
+    @property
+    def client(self):
+        return get_s3_client()
+
+    def forget(self, key: str) -> None:
+        super().forget(key)
+        cache = get_media_cache()
+        if cache is not None:
+            cache.discard(key)
+
+    @guarded(timed=False)
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        self.forget(key)
+        try:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=data,
+                ContentType=content_type,
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 upload failed: {str(e)}") from e
+
+    @guarded(timed=False)
+    def save_file(self, key: str, path: str, content_type: str) -> None:
+        from boto3.s3.transfer import TransferConfig
+
+        self.forget(key)
+        config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MULTIPART_CONCURRENCY,
+            use_threads=settings.S3_MULTIPART_CONCURRENCY > 1,
+        )
+        try:
+            # Streams from disk; large files become a multipart upload with
+            # parts sent concurrently
+            self.client.upload_file(
+                path,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=config,
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 upload failed: {str(e)}") from e
+
+    @guarded
+    def copy(self, src_key: str, dst_key: str, content_type: str) -> None:
+        self.forget(dst_key)
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=dst_key,
+                CopySource={"Bucket": self.bucket, "Key": src_key},
+                ContentType=content_type,
+                MetadataDirective="REPLACE",
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            if _is_not_found(e):
+                raise ObjectNotFound(src_key) from e
+            raise StorageError(f"S3 copy failed: {str(e)}") from e
+
+    def presign_post(self, key: str, content_type: str, max_size: int, expires: int) -> dict:
+        try:
+            return self.client.generate_presigned_post(
+                Bucket=self.bucket,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, max_size],
+                ],
+                ExpiresIn=expires,
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 presign failed: {str(e)}") from e
+
+    def presign_put(self, key: str, content_type: str, size: int, expires: int) -> str:
+        try:
+            # Signed headers: the browser must send exactly this type and length
+            return self.client.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": key,
+                    "ContentType": content_type,
+                    "ContentLength": size,
+                },
+                ExpiresIn=expires,
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 presign failed: {str(e)}") from e
+
+    def presign_get(self, key: str, expires: int) -> str:
+        try:
+            return self.client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": key,
+                    # Each URL is only used within its window; let browsers keep it
+                    "ResponseCacheControl": "public, max-age=31536000, immutable",
+                },
+                ExpiresIn=expires,
+            )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 presign failed: {str(e)}") from e
+
+    @guarded
+    def open(self, key: str, byte_range: Optional[str] = None) -> StoredObject:
+        params = {"Bucket": self.bucket, "Key": key}
+        if is_byte_range(byte_range):
+            # S3 resolves the range itself and answers with ContentRange
+            params["Range"] = byte_range.strip()
+
+        try:
+            obj = self.client.get_object(**params)
+        except StorageError:
+            raise
+        except Exception as e:
+            if _is_not_found(e):
+                raise ObjectNotFound(key) from e
+            if _error_code(e) == "InvalidRange":
+                raise InvalidRange(byte_range) from e
+            raise StorageError(f"S3 read failed: {str(e)}") from e
+
+        return StoredObject(
+            key=key,
+            body=obj["Body"],
+            content_type=obj.get("ContentType", "image/jpeg"),
+            content_length=obj.get("ContentLength"),
+            etag=obj.get("ETag"),
+            last_modified=obj.get("LastModified"),
+            content_range=obj.get("ContentRange"),
+        )
+
+    @guarded
+    def head(self, key: str) -> ObjectInfo:
+        try:
+            obj = self.client.head_object(Bucket=self.bucket, Key=key)
+        except StorageError:
+            raise
+        except Exception as e:
+            if _is_not_found(e):
+                raise ObjectNotFound(key) from e
+            raise StorageError(f"S3 head failed: {str(e)}") from e
+
+        return ObjectInfo(
+            key=key,
+            size=obj.get("ContentLength", 0),
+            content_type=obj.get("ContentType", "image/jpeg"),
+            etag=obj.get("ETag"),
+            last_modified=obj.get("LastModified"),
+        )
+
+    @guarded
+    def delete(self, key: str) -> bool:
+        self.forget(key)
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 delete failed: {str(e)}") from e
+        # S3 deletes are idempotent and do not report whether the key existed
+        return True
+
+    @guarded
+    def delete_many(self, keys: Iterable[str]) -> List[str]:
+        keys = list(dict.fromkeys(keys))
+        failed = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            for key in batch:
+                self.forget(key)
+            try:
+                result = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except StorageError:
+                raise
+            except Exception as e:
+                raise StorageError(f"S3 batch delete failed: {str(e)}") from e
+            # Quiet mode only reports the keys that failed
+            failed.extend(error["Key"] for error in result.get("Errors", []))
+        return failed
+
+    def list(self, prefix: str = "") -> Iterator[ObjectInfo]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        try:
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    yield ObjectInfo(
+                        key=obj["Key"],
+                        size=obj.get("Size", 0),
+                        # Listings carry no content type
+                        content_type=mimetypes.guess_type(obj["Key"])[0] or "application/octet-stream",
+                        etag=obj.get("ETag"),
+                        last_modified=obj.get("LastModified"),
+                    )
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"S3 list failed: {str(e)}") from e
+
+    def url(self, key: str) -> str:
+        # Proxied through our own backend instead of a direct S3 URL.
+        # This avoids the Tigris/Railway S3 public access problem entirely —
+        # images are served through FastAPI which already has correct CORS headers.
+        return f"{settings.BACKEND_URL}/api/v1/upload/media/{key}"
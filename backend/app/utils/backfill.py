@@ -0,0 +1,409 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.media import media_asset
+from app.schemas.media import MediaAssetCreate
+from app.storage import ObjectInfo, StorageBackend
+from app.utils.files import is_content_key
+from app.utils.image_executor import ImageExecutor
+from app.utils.images import derivative_key, optimize_bytes, render_derivatives, summarize_image
+from app.utils.media import original_stem, refresh_image_meta, update_ref_counts
+
+logger = logging.getLogger("entourage.images")
+
+# Direct-upload staging area; its objects are moved, not re-optimised
+_SKIP_PREFIXES = ("uploads/",)
+
+
+# ── Worker side (runs in the image process pool) ─────────────────────────────
+
+def process_image(
+    path: str,
+    max_width: int,
+    quality: int,
+    min_savings: float,
+    reencode: bool = True,
+) -> dict:
+    """
+    Re-encode one stored original and render its derivative ladder.
+
+    The optimised original is only returned if `reencode` is set and it is
+    at least `min_savings` (a fraction) smaller than the stored one;
+    derivatives are always rendered from the stored bytes, not the
+    re-encoded copy.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    optimized = optimize_bytes(data, max_width, quality) if reencode else None
+    if optimized is not None and len(optimized) > len(data) * (1 - min_savings):
+        optimized = None
+
+    _, _, derivatives = render_derivatives(data)
+    return {
+        "original": optimized,
+        "derivatives": [(d.width, d.format, d.content_type, d.data) for d in derivatives],
+        "summary": summarize_image(optimized or data),
+    }
+
+
+# ── Checksum manifest ──────────────────────────────────────────────────────────
+
+class Manifest:
+    """
+    JSON record of objects already backfilled, so an interrupted run can be
+    resumed and a repeated run skips finished work.
+
+    Entries are keyed by "<source>:<key>" and hold the object's ETag and
+    SHA-256 as written by the backfill plus the settings it was processed
+    with. Written atomically every `flush_every` records.
+    """
+
+    def __init__(self, path: str, flush_every: int = 25):
+        self.path = path
+        self.flush_every = flush_every
+        self._dirty = 0
+        self.entries: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, entry_id: str) -> Optional[dict]:
+        return self.entries.get(entry_id)
+
+    def record(self, entry_id: str, entry: dict) -> None:
+        self.entries[entry_id] = entry
+        self._dirty += 1
+        if self._dirty >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
+
+
+def settings_signature(max_width: int, quality: int) -> str:
+    """Identifies the output settings; changing any of them reprocesses everything."""
+    widths = ",".join(str(w) for w in settings.image_derivative_widths)
+    formats = ",".join(settings.image_derivative_formats)
+    return f"w{max_width}-q{quality}-ladder{widths}-{formats}-q{settings.IMAGE_QUALITY}"
+
+
+# ── Per-object job (runs in an I/O thread) ─────────────────────────────────────
+
+@dataclass
+class BackfillResult:
+    source: str
+    key: str
+    status: str  # "optimized" | "derivatives" | "unchanged" | "failed"
+    bytes_before: int = 0
+    bytes_after: int = 0
+    derivative_bytes: int = 0
+    derivatives: int = 0
+    full_width_bytes: int = 0  # smallest derivative at the image's full display width
+    entry: Optional[dict] = None
+    summary: Optional[dict] = None
+    content_type: str = ""
+    sha256: str = ""
+    error: str = ""
+
+
+def is_backfill_candidate(key: str) -> bool:
+    """Original images only: no derivatives, no staged direct uploads, no other files."""
+    if key.startswith(_SKIP_PREFIXES):
+        return False
+    name = key.rsplit("/", 1)[-1]
+    if "." not in name or name.rsplit(".", 1)[-1].lower() not in settings.allowed_extensions_list:
+        return False
+    return original_stem(key) == key.rsplit(".", 1)[0]
+
+
+def _download(storage: StorageBackend, key: str) -> Tuple[str, str]:
+    """Copy an object to a temp file. Returns (path, sha256)."""
+    obj = storage.open(key)
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(prefix="backfill-")
+    with os.fdopen(fd, "wb") as out:
+        for chunk in obj.iter_chunks(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            out.write(chunk)
+    return path, digest.hexdigest()
+
+
+def _backfill_one(
+    source: str,
+    storage: StorageBackend,
+    info: ObjectInfo,
+    executor: ImageExecutor,
+    previous: Optional[dict],
+    signature: str,
+    max_width: int,
+    quality: int,
+    min_savings: float,
+    dry_run: bool,
+) -> BackfillResult:
+    result = BackfillResult(source, info.key, "failed", bytes_before=info.size, content_type=info.content_type)
+    path = None
+    try:
+        path, sha256 = _download(storage, info.key)
+        result.sha256 = sha256
+        if previous and previous.get("sha256") == sha256 and previous.get("signature") == signature:
+            # Same bytes as we wrote last time (the ETag alone did not match)
+            result.status = "unchanged"
+            result.bytes_after = info.size
+            result.entry = dict(previous, etag=info.etag)
+            return result
+
+        # A content-addressed key names its bytes (and is served immutable,
+        # deduplicated against and cached by hash), so only legacy keys are
+        # rewritten in place; content-addressed originals get derivatives only.
+        reencode = not is_content_key(info.key)
+        output = executor.run_sync("backfill", process_image, path, max_width, quality, min_savings, reencode)
+        original = output["original"]
+        result.summary = output["summary"]
+        result.status = "optimized" if original else "derivatives"
+        result.bytes_after = len(original) if original else info.size
+        top = max((width for width, _, _, _ in output["derivatives"]), default=0)
+        result.full_width_bytes = min(
+            (len(data) for width, _, _, data in output["derivatives"] if width == top),
+            default=result.bytes_after,
+        )
+        for width, fmt, content_type, data in output["derivatives"]:
+            result.derivatives += 1
+            result.derivative_bytes += len(data)
+            if not dry_run:
+                storage.save(derivative_key(info.key, width, fmt), data, content_type)
+
+        if dry_run:
+            return result
+        if original:
+            storage.save(info.key, original, info.content_type)
+            sha256 = hashlib.sha256(original).hexdigest()
+            result.sha256 = sha256
+        written = storage.head(info.key)
+        result.entry = {
+            "etag": written.etag,
+            "sha256": sha256,
+            "signature": signature,
+            "bytes_before": info.size,
+            "bytes_after": result.bytes_after,
+        }
+    except Exception as e:
+        result.status = "failed"
+        result.error = str(e)
+    finally:
+        if path:
+            os.remove(path)
+    return result
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────────
+
+@dataclass
+class BackfillReport:
+    scanned: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    optimized: int = 0
+    derivatives_only: int = 0
+    failed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    derivative_bytes: int = 0
+    derivatives: int = 0
+    full_width_bytes: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.optimized + self.derivatives_only + self.unchanged
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed or 1e-9
+        return {
+            "scanned": self.scanned,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "optimized": self.optimized,
+            "derivatives_only": self.derivatives_only,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "bytes_saved": self.bytes_before - self.bytes_after,
+            "derivatives_written": self.derivatives,
+            "derivative_bytes": self.derivative_bytes,
+            # What a srcset client downloads at full width instead of the original
+            "full_width_bytes": self.full_width_bytes,
+            "bytes_saved_served": self.bytes_before - self.full_width_bytes,
+            "elapsed_s": round(self.elapsed, 2),
+            "objects_per_s": round(self.processed / elapsed, 2),
+            "mb_per_s": round(self.bytes_before / elapsed / 1024 / 1024, 2),
+            "errors": self.errors[:20],
+        }
+
+
+def _register(db: Session, result: BackfillResult) -> None:
+    """Bring the media registry row for a backfilled object up to date."""
+    summary = result.summary or {}
+    asset = media_asset.get_by_key(db, key=result.key)
+    if asset is None:
+        media_asset.register(db, obj_in=MediaAssetCreate(
+            key=result.key,
+            size=result.bytes_after,
+            content_type=result.content_type,
+            sha256=result.sha256,
+            **summary,
+        ))
+    else:
+        media_asset.update(db, db_obj=asset, obj_in={
+            "size": result.bytes_after,
+            "content_type": result.content_type,
+            "sha256": result.sha256,
+            **summary,
+        })
+
+
+def backfill(
+    sources: List[Tuple[str, StorageBackend]],
+    manifest: Manifest,
+    executor: ImageExecutor,
+    *,
+    db: Optional[Session] = None,
+    registry_source: Optional[str] = None,
+    prefix: str = "",
+    jobs: int = 8,
+    max_width: int = 1920,
+    quality: int = 85,
+    min_savings: float = 0.05,
+    dry_run: bool = False,
+    progress: Optional[Callable[[BackfillReport], None]] = None,
+    progress_every: float = 2.0,
+) -> BackfillReport:
+    """
+    Re-optimise stored originals and regenerate their derivatives.
+
+    Objects are listed lazily from each (name, backend) source. Downloads
+    and writes run on `jobs` threads, and Pillow work runs in `executor`'s
+    process pool, with at most 2 x `jobs` objects in flight. Objects whose
+    ETag and settings match the manifest are skipped without downloading.
+    A legacy original is overwritten in place, under the same key, only
+    when re-encoding saves at least `min_savings`. Content-addressed
+    originals (media/<sha256>.<ext>) are never rewritten, since their key
+    is the hash of their bytes. Derivatives are always rewritten.
+
+    Args:
+        sources: (name, backend) pairs to walk, e.g. [("local", ...), ("s3", ...)]
+        manifest: Checksum manifest used to skip and resume
+        executor: Process pool for image work
+        db: Session for registry updates (skipped when None or dry run)
+        registry_source: Name of the source the app serves from; only its
+            objects are written to the media registry
+        prefix: Only consider keys under this prefix
+        jobs: I/O threads
+        max_width: Originals wider than this are downscaled
+        quality: Encoder quality for re-encoded originals
+        min_savings: Minimum fractional size reduction to replace an original
+        dry_run: Do all the work but write nothing
+        progress: Called with the running report every `progress_every` seconds
+
+    Returns:
+        The final report
+    """
+    report = BackfillReport()
+    signature = settings_signature(max_width, quality)
+    registered: List[str] = []
+    started = time.monotonic()
+    last_progress = started
+
+    def handle(result: BackfillResult) -> None:
+        if result.status == "failed":
+            report.failed += 1
+            report.errors.append(f"{result.source}:{result.key}: {result.error}")
+            logger.warning(f"Backfill failed for {result.source}:{result.key}: {result.error}")
+            return
+        report.bytes_before += result.bytes_before
+        report.bytes_after += result.bytes_after
+        report.derivatives += result.derivatives
+        report.derivative_bytes += result.derivative_bytes
+        report.full_width_bytes += result.full_width_bytes or result.bytes_after
+        if result.status == "unchanged":
+            report.unchanged += 1
+        elif result.status == "optimized":
+            report.optimized += 1
+        else:
+            report.derivatives_only += 1
+        if dry_run:
+            return
+        manifest.record(f"{result.source}:{result.key}", result.entry)
+        if db is not None and result.source == registry_source and result.summary is not None:
+            _register(db, result)
+            registered.append(result.key)
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="backfill") as pool:
+        pending: Dict[Future, str] = {}
+
+        def drain(block: bool) -> None:
+            nonlocal last_progress
+            if not pending:
+                return
+            done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                handle(future.result())
+            now = time.monotonic()
+            if progress and now - last_progress >= progress_every:
+                report.elapsed = now - started
+                progress(report)
+                last_progress = now
+
+        try:
+            for name, storage in sources:
+                for info in storage.list(prefix):
+                    if not is_backfill_candidate(info.key):
+                        continue
+                    report.scanned += 1
+                    previous = manifest.get(f"{name}:{info.key}")
+                    if (
+                        previous
+                        and previous.get("signature") == signature
+                        and info.etag
+                        and previous.get("etag") == info.etag
+                    ):
+                        report.skipped += 1
+                        continue
+                    while len(pending) >= jobs * 2:
+                        drain(block=True)
+                    future = pool.submit(
+                        _backfill_one, name, storage, info, executor, previous, signature,
+                        max_width, quality, min_savings, dry_run,
+                    )
+                    pending[future] = info.key
+                    drain(block=False)
+            while pending:
+                drain(block=True)
+        finally:
+            manifest.flush()
+
+    if db is not None and registered:
+        update_ref_counts(db, registered)
+        refresh_image_meta(db, registered)
+        db.commit()
+
+    report.elapsed = time.monotonic() - started
+    return report
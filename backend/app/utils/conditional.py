@@ -0,0 +1,117 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.utils.http import http_date, is_not_modified
+
+
+class Validator(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _stamp(table):
+    """Row change time: updated_at, falling back to created_at where it may be NULL."""
+    columns = [table.c[name] for name in ("updated_at", "created_at") if name in table.c]
+    return func.coalesce(*columns) if len(columns) > 1 else columns[0]
+
+
+def _make(parts: list, stamps: Iterable[Optional[datetime]]) -> Validator:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    stamps = [s for s in stamps if s is not None]
+    # Weak: the tag identifies the data the body was built from, not its bytes
+    return Validator(f'W/"{digest}"', max(stamps) if stamps else None)
+
+
+def table_validator(db: Session, tables: Iterable[str]) -> Validator:
+    """
+    Validator for a collection built from `tables`: row count and newest
+    change time of each table, read as scalar subqueries of a single
+    SELECT (one round trip however many tables). Any insert, update or
+    delete changes it.
+
+    Args:
+        db: Database session
+        tables: Table names the response is built from
+
+    Returns:
+        Weak ETag and the newest change time
+    """
+    tables = list(tables)
+    columns = []
+    for name in tables:
+        table = Base.metadata.tables[name]
+        columns.append(select(func.count()).select_from(table).scalar_subquery())
+        columns.append(select(func.max(_stamp(table))).scalar_subquery())
+    row = db.execute(select(*columns)).one()
+    parts = [(name, row[2 * i], row[2 * i + 1]) for i, name in enumerate(tables)]
+    return _make(parts, row[1::2])
+
+
+def row_validator(db: Session, model, *criteria, children=None) -> Optional[Validator]:
+    """
+    Validator for the single `model` row matching `criteria`, read from
+    its timestamp columns only. `children` is an optional one-to-many
+    relationship (e.g. Project.images) whose count and newest change time
+    are folded in, so editing a child changes the parent's validator.
+
+    Returns:
+        Weak ETag and change time, or None if no row matches
+    """
+    table = model.__table__
+    columns = [table.c.id, _stamp(table)]
+    query = db.query(*columns).filter(*criteria)
+    if children is not None:
+        child = children.property.mapper.class_.__table__
+        query = query.outerjoin(children).add_columns(func.count(child.c.id), func.max(_stamp(child)))
+        query = query.group_by(*columns)
+    row = query.first()
+    if row is None:
+        return None
+    return _make([table.name, *row], row[1::2])  # (id, stamp[, child count, child stamp])
+
+
+def validator_headers(validator: Validator) -> dict:
+    headers = {"ETag": validator.etag, "Cache-Control": "no-cache"}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = http_date(validator.last_modified)
+    return headers
+
+
+def not_modified(
+    request: Request,
+    validator: Optional[Validator],
+    response: Optional[Response] = None,
+    *,
+    use_last_modified: bool = True,
+) -> Optional[Response]:
+    """
+    Evaluate the request's conditional headers against `validator`.
+
+    The validator headers are copied onto `response` (the endpoint's
+    Response parameter) so a full 200 carries them too. Cache-Control:
+    no-cache makes browsers revalidate on every fetch instead of guessing
+    a freshness lifetime from Last-Modified.
+
+    Args:
+        request: Incoming request
+        validator: Current validator (None answers nothing, e.g. a 404)
+        response: Response whose headers receive ETag/Last-Modified
+        use_last_modified: Honour If-Modified-Since. Collections pass False:
+            deleting a row does not move their newest change time.
+
+    Returns:
+        A 304 response if the client's copy is current, else None
+    """
+    if validator is None:
+        return None
+    headers = validator_headers(validator)
+    if response is not None:
+        response.headers.update(headers)
+    last_modified = validator.last_modified if use_last_modified else None
+    if is_not_modified(request.headers, validator.etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return None
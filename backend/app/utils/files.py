@@ -1,9 +1,32 @@
+import asyncio
+import hashlib
+import logging
 import os
+import re
+import tempfile
 import uuid
-from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple, Union
 from fastapi import UploadFile, HTTPException
-from PIL import Image
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.crud.media import media_asset
+from app.database import run_db
+from app.schemas.media import MediaAssetCreate
+from app.storage import get_storage, run_storage, StorageError, StorageUnavailable, ObjectNotFound
+from app.utils.image_executor import get_image_executor
+from app.utils.media_cleanup import get_media_cleanup
+from app.utils.images import (
+    render_derivatives, derivative_key, optimize_file, image_size, target_widths, summarize_image,
+)
+
+logger = logging.getLogger("entourage.images")
+
+# Prefix of content-addressed upload keys
+CONTENT_KEY_PREFIX = "media"
+_CONTENT_KEY = re.compile(rf"^{CONTENT_KEY_PREFIX}/[0-9a-f]{{32}}\.[a-z0-9]+$")
 
 
 def validate_file_extension(filename: str) -> bool:
@@ -55,13 +78,142 @@ def generate_unique_filename(original_filename: str) -> str:
     return f"{unique_id}.{extension}"
 
 
+@dataclass
+class SpooledUpload:
+    """An upload copied to a temp file on local disk."""
+    path: str
+    size: int
+    sha256: str
+
+
+def content_key(digest: str, extension: str) -> str:
+    """
+    Content-addressed storage key: identical bytes always map to the same
+    key, whichever section (project, blog, service) they were uploaded for.
+    """
+    extension = {"jpeg": "jpg"}.get(extension.lower(), extension.lower())
+    return f"{CONTENT_KEY_PREFIX}/{digest[:32]}.{extension}"
+
+
+def is_content_key(key: str) -> bool:
+    """True for keys made by `content_key`, whose bytes must never change."""
+    return bool(_CONTENT_KEY.match(key))
+
+
+def object_exists(key: str) -> bool:
+    try:
+        get_storage().stat(key)
+    except ObjectNotFound:
+        return False
+    return True
+
+
+def file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Max size is {settings.MAX_FILE_SIZE // (1024 * 1024)}MB."
+    )
+
+
+def storage_error(e: StorageError, status_code: int = 502) -> HTTPException:
+    """
+    HTTP error for a failed storage call: a fast 503 with Retry-After while
+    the storage circuit breaker is open, otherwise `status_code`.
+    """
+    if isinstance(e, StorageUnavailable):
+        return HTTPException(
+            status_code=503,
+            detail="Media storage is temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return HTTPException(status_code=status_code, detail=str(e))
+
+
+@asynccontextmanager
+async def spool_upload(file: UploadFile) -> AsyncIterator[SpooledUpload]:
+    """
+    Copy an upload to a temp file UPLOAD_CHUNK_SIZE bytes at a time,
+    rejecting it as soon as it grows past MAX_FILE_SIZE. The temp file is
+    removed when the block exits.
+    
+    Args:
+        file: Uploaded file
+        
+    Yields:
+        The spooled upload (path, size and SHA-256 of the contents)
+        
+    Raises:
+        HTTPException: 413 if the file is larger than MAX_FILE_SIZE
+    """
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        size = 0
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.MAX_FILE_SIZE:
+                    raise file_too_large()
+                digest.update(chunk)
+                out.write(chunk)
+        yield SpooledUpload(path=path, size=size, sha256=digest.hexdigest())
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _download_to(key: str, fd: int) -> Tuple[int, str]:
+    obj = get_storage().open(key)
+    size = 0
+    digest = hashlib.sha256()
+    with os.fdopen(fd, "wb") as out:
+        for chunk in obj.iter_chunks(settings.UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            digest.update(chunk)
+            out.write(chunk)
+    return size, digest.hexdigest()
+
+
+@asynccontextmanager
+async def spool_stored_object(key: str) -> AsyncIterator[SpooledUpload]:
+    """
+    Download a stored object to a temp file, hashing it on the way, so it
+    can be processed like a regular upload. The temp file is removed when
+    the block exits.
+    
+    Args:
+        key: Storage key to download
+        
+    Yields:
+        The spooled copy (path, size and SHA-256 of the contents)
+        
+    Raises:
+        ObjectNotFound: If the key does not exist
+    """
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        size, sha256 = await run_storage(_download_to, key, fd)
+        yield SpooledUpload(path=path, size=size, sha256=sha256)
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
 async def save_upload_file(file: UploadFile, subfolder: str = "") -> str:
     """
-    Save uploaded file to static directory.
+    Save uploaded file to the configured storage backend.
     
     Args:
         file: Uploaded file
-        subfolder: Subdirectory within static folder (e.g., "services", "projects")
+        subfolder: Kept for compatibility; keys are content-addressed and
+            shared between sections
         
     Returns:
         Relative path to saved file
@@ -76,52 +228,187 @@ async def save_upload_file(file: UploadFile, subfolder: str = "") -> str:
             detail=f"File type not allowed. Allowed types: {', '.join(settings.allowed_extensions_list)}"
         )
     
-    # Validate size
-    if not validate_file_size(file):
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
-    
-    # Generate unique filename
-    unique_filename = generate_unique_filename(file.filename)
-    
-    # Create full path
-    save_dir = os.path.join(settings.UPLOAD_DIR, subfolder)
-    os.makedirs(save_dir, exist_ok=True)
-    
-    file_path = os.path.join(save_dir, unique_filename)
-    
-    # Save file
-    contents = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Spool to disk (validating size and hashing as we go), then stream into
+    # the configured backend (S3 or local static/) unless identical bytes
+    # are already stored under the same content key
+    extension = file.filename.rsplit(".", 1)[-1]
+    async with spool_upload(file) as upload:
+        key = content_key(upload.sha256, extension)
+        try:
+            if not await run_storage(object_exists, key):
+                await run_storage(
+                    get_storage().save_file, key, upload.path, file.content_type or "image/jpeg"
+                )
+        except StorageError as e:
+            raise storage_error(e, status_code=500)
     
+    # A row is about to reference the key; don't let a pending cleanup take it
+    get_media_cleanup().hold(key)
     # Return relative path
-    return os.path.join(subfolder, unique_filename).replace("\\", "/")
+    return key
 
 
 def delete_file(file_path: str) -> bool:
     """
-    Delete a file from static directory.
+    Delete a file from the configured storage backend.
     
     Args:
-        file_path: Relative path to file
+        file_path: Relative path (storage key) to file
         
     Returns:
         True if deleted successfully
     """
-    full_path = os.path.join(settings.UPLOAD_DIR, file_path)
+    try:
+        return get_storage().delete(file_path)
+    except StorageError:
+        return False
+
+
+def _manifest(key: str, width: int, height: int, variants: list) -> dict:
+    """Describe stored derivatives as a srcset-ready manifest."""
+    storage = get_storage()
+    entries = []
+    for w, h, fmt, content_type, size in variants:
+        variant_key = derivative_key(key, w, fmt)
+        entries.append({
+            "width": w,
+            "height": h,
+            "format": fmt,
+            "content_type": content_type,
+            "size": size,
+            "file_path": variant_key,
+            "url": storage.url(variant_key),
+        })
+
+    srcset = {}
+    for fmt in dict.fromkeys(v["format"] for v in entries):
+        srcset[fmt] = ", ".join(
+            f"{v['url']} {v['width']}w" for v in entries if v["format"] == fmt
+        )
+
+    return {
+        "width": width,
+        "height": height,
+        "srcset": srcset,
+        "variants": entries,
+    }
+
+
+async def _existing_derivatives(key: str, source: Union[bytes, str]) -> Optional[dict]:
+    """Manifest for derivatives already stored for `key`, or None if any is missing."""
+    try:
+        width, height = await run_in_threadpool(image_size, source)
+    except Exception:
+        return None
+
+    planned = [
+        (w, max(1, round(height * w / width)), fmt)
+        for w in target_widths(width, settings.image_derivative_widths)
+        for fmt in settings.image_derivative_formats
+    ]
+    storage = get_storage()
+    infos = await asyncio.gather(
+        *(run_storage(storage.stat, derivative_key(key, w, fmt)) for w, _, fmt in planned),
+        return_exceptions=True,
+    )
+    if any(isinstance(info, BaseException) for info in infos):
+        return None
+    return _manifest(key, width, height, [
+        (w, h, fmt, info.content_type, info.size) for (w, h, fmt), info in zip(planned, infos)
+    ])
+
+
+async def store_image_derivatives(
+    key: str, source: Union[bytes, str], existing: bool = False
+) -> Optional[dict]:
+    """
+    Render the responsive derivative ladder for an uploaded image and store
+    each variant next to the original.
     
-    if os.path.exists(full_path):
-        os.remove(full_path)
-        return True
-    return False
+    Args:
+        key: Storage key of the original (e.g. "media/ab12....png")
+        source: Original image bytes, or the path of a local copy
+        existing: The original was already stored (a duplicate upload);
+            reuse its derivatives when they are all present
+        
+    Returns:
+        srcset-ready manifest, or None if derivatives are disabled or the
+        file could not be decoded as an image
+        
+    Raises:
+        StorageError: If a derivative could not be written
+    """
+    if not settings.IMAGE_DERIVATIVES_ENABLED:
+        return None
+
+    if existing:
+        manifest = await _existing_derivatives(key, source)
+        if manifest is not None:
+            return manifest
+
+    try:
+        width, height, derivatives = await get_image_executor().run(
+            "derivatives",
+            render_derivatives,
+            source,
+            settings.image_derivative_widths,
+            settings.image_derivative_formats,
+            settings.IMAGE_QUALITY,
+        )
+    except Exception as e:
+        logger.warning(f"Could not build derivatives for {key}: {e}")
+        return None
+
+    storage = get_storage()
+    # Variants are independent objects — write them in parallel
+    await asyncio.gather(*(
+        run_storage(storage.save, derivative_key(key, d.width, d.format), d.data, d.content_type)
+        for d in derivatives
+    ))
+
+    return _manifest(key, width, height, [
+        (d.width, d.height, d.format, d.content_type, len(d.data)) for d in derivatives
+    ])
+
+
+async def register_upload(
+    db: Session, key: str, upload: SpooledUpload, content_type: str
+) -> Optional[dict]:
+    """
+    Record an upload in the media registry: size, content type, hash and
+    placeholder metadata (intrinsic size, dominant colour, blurred LQIP).
+    Done once per stored object; duplicate uploads reuse the registered row.
+    
+    Args:
+        db: Database session
+        key: Storage key of the original
+        upload: The spooled upload
+        content_type: MIME type it was stored with
+        
+    Returns:
+        The image metadata, or None if the file could not be decoded
+    """
+    asset = await run_db(db, media_asset.get_by_key, db, key=key)
+    if asset is None:
+        try:
+            summary = await get_image_executor().run("summary", summarize_image, upload.path)
+        except Exception as e:
+            logger.warning(f"Could not summarize {key}: {e}")
+            summary = {}
+        asset = await run_db(db, media_asset.register, db, obj_in=MediaAssetCreate(
+            key=key,
+            size=upload.size,
+            content_type=content_type,
+            sha256=upload.sha256,
+            **summary,
+        ))
+    # Attribute access may refresh the row after the commit
+    return await run_db(db, lambda: asset.meta() if asset.width else None)
 
 
 async def optimize_image(file_path: str, max_width: int = 1920, quality: int = 85) -> None:
     """
-    Optimize an image file (resize and compress).
+    Optimize an image file (resize and compress) in the image process pool.
     
     Args:
         file_path: Path to image file
@@ -130,20 +417,7 @@ async def optimize_image(file_path: str, max_width: int = 1920, quality: int = 8
     """
     try:
         full_path = os.path.join(settings.UPLOAD_DIR, file_path)
-        
-        with Image.open(full_path) as img:
-            # Convert RGBA to RGB if necessary
-            if img.mode == "RGBA":
-                img = img.convert("RGB")
-            
-            # Resize if needed
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save optimized
-            img.save(full_path, optimize=True, quality=quality)
+        await get_image_executor().run("optimize", optimize_file, full_path, max_width, quality)
     except Exception as e:
         # If optimization fails, keep original file
-        pass
\ No newline at end of file
+        logger.warning(f"Could not optimize {file_path}: {e}")
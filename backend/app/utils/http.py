@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def http_date(dt: datetime) -> str:
+    """Format a datetime as an RFC 7231 HTTP-date (always GMT)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(header: str, etag: Optional[str]) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _strip_weak(etag)
+    return any(_strip_weak(tag) == current for tag in header.split(","))
+
+
+def if_range_matches(header: str, etag: Optional[str]) -> bool:
+    """
+    Strong comparison of an If-Range header against an ETag (RFC 9110
+    §13.1.5): a weak tag on either side never matches, so the client gets
+    the full representation. The HTTP-date form is not honoured either.
+    """
+    tag = header.strip()
+    if not etag or not tag.startswith('"') or etag.startswith("W/"):
+        return False
+    return tag == etag.strip()
+
+
+def is_not_modified(
+    headers: Mapping[str, str],
+    etag: Optional[str],
+    last_modified: Optional[datetime],
+) -> bool:
+    """
+    Evaluate conditional GET headers (RFC 7232 §6).
+    If-None-Match wins over If-Modified-Since when both are sent.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        since = _parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
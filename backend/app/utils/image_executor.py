@@ -0,0 +1,153 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+
+def _timed_call(fn: Callable, args: tuple) -> Tuple[Any, float]:
+    """Runs inside the worker process: call `fn` and report how long it took."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class _JobStats:
+    __slots__ = ("count", "failures", "total_run", "max_run", "total_wait")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total_run = 0.0
+        self.max_run = 0.0
+        self.total_wait = 0.0
+
+    def as_dict(self) -> dict:
+        done = self.count or 1
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_run_ms": round(self.total_run / done * 1000, 1),
+            "max_run_ms": round(self.max_run * 1000, 1),
+            "avg_wait_ms": round(self.total_wait / done * 1000, 1),
+        }
+
+
+class ImageExecutor:
+    """
+    Process pool for CPU-bound Pillow work (decode, resize, re-encode).
+
+    Keeps image processing off the event loop and out of the GIL so a batch
+    of large uploads cannot stall public page loads. At most
+    `workers + queue_size` jobs are admitted at once; further callers wait
+    for a slot, so a burst of uploads cannot queue unbounded work (and
+    memory for the image bytes) behind the pool. The bound applies to
+    `run()`; `run_sync()` is for scripts that size their own concurrency.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._stats: Dict[str, _JobStats] = {}
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn: forking a process that already runs threads is not safe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._pool
+
+    def _record(self, name: str, run: float, wait: float, failed: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, _JobStats())
+            stats.count += 1
+            stats.failures += int(failed)
+            stats.total_run += run
+            stats.max_run = max(stats.max_run, run)
+            stats.total_wait += wait
+
+    async def run(self, name: str, fn: Callable, *args) -> Any:
+        """
+        Run `fn(*args)` in the pool and await its result.
+        `fn` and its arguments must be picklable (module-level functions).
+        """
+        submitted = time.perf_counter()
+        async with self._slots:
+            self.in_flight += 1
+            failed = False
+            run = 0.0
+            try:
+                result, run = await asyncio.wrap_future(self._get_pool().submit(_timed_call, fn, args))
+                return result
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self.in_flight -= 1
+                total = time.perf_counter() - submitted
+                self._record(name, run, max(total - run, 0.0), failed)
+
+    def run_sync(self, name: str, fn: Callable, *args) -> Any:
+        """Blocking variant of `run()` for scripts and threadpool code."""
+        submitted = time.perf_counter()
+        failed = False
+        run = 0.0
+        try:
+            result, run = self._get_pool().submit(_timed_call, fn, args).result()
+            return result
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            total = time.perf_counter() - submitted
+            self._record(name, run, max(total - run, 0.0), failed)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            jobs = {name: s.as_dict() for name, s in self._stats.items()}
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "jobs": jobs,
+        }
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_executor: Optional[ImageExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_image_executor() -> ImageExecutor:
+    """Return the process-wide image executor (the pool itself starts lazily)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ImageExecutor(
+                    workers=settings.IMAGE_WORKERS or os.cpu_count() or 1,
+                    queue_size=settings.IMAGE_QUEUE_SIZE,
+                )
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    if _executor is not None:
+        _executor.shutdown()
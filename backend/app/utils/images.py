@@ -0,0 +1,236 @@
+import base64
+import io
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+from PIL import Image, ImageFilter, ImageOps
+from app.core.config import settings
+
+# Pillow format name, file extension and MIME type for each derivative format
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+@dataclass
+class Derivative:
+    """A resized, re-encoded copy of an uploaded image."""
+    width: int
+    height: int
+    format: str  # key of FORMATS
+    data: bytes
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.format][1]
+
+    @property
+    def content_type(self) -> str:
+        return FORMATS[self.format][2]
+
+
+def load_image(source: Union[bytes, str]) -> Image.Image:
+    """
+    Decode image bytes (or a file path) and apply the EXIF orientation, so
+    phone photos come out the right way up once the EXIF block is dropped.
+    """
+    img = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    img = ImageOps.exif_transpose(img)
+    img.load()
+    return img
+
+
+def to_rgb(img: Image.Image) -> Image.Image:
+    """Convert to RGB, flattening any transparency onto white."""
+    if img.mode == "RGB":
+        return img
+    if img.mode in ("RGBA", "LA", "P"):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    return img.convert("RGB")
+
+
+def image_size(source: Union[bytes, str]) -> Tuple[int, int]:
+    """Displayed (EXIF-oriented) size of an image, read from its header without decoding."""
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        width, height = img.size
+        # Orientations 5–8 rotate by 90°, swapping the axes
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+    return width, height
+
+
+def encode_image(img: Image.Image, fmt: str, quality: int) -> bytes:
+    """
+    Encode `img` as `fmt` without EXIF/XMP metadata.
+    The ICC profile is kept so colours render the same as the original.
+    """
+    pil_format = FORMATS[fmt][0]
+    icc_profile = img.info.get("icc_profile")
+
+    if pil_format == "JPEG" and img.mode != "RGB":
+        # JPEG has no alpha channel
+        img = to_rgb(img)
+    elif pil_format == "WEBP" and img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB")
+
+    out = io.BytesIO()
+    options = {"quality": quality}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    if pil_format == "JPEG":
+        options.update(optimize=True, progressive=True)
+    else:
+        options.update(method=4)
+    img.save(out, pil_format, **options)
+    return out.getvalue()
+
+
+def summarize_image(source: Union[bytes, str]) -> dict:
+    """
+    Describe an image for placeholder rendering: its intrinsic (EXIF-oriented)
+    size, its dominant colour as "#rrggbb" and a tiny blurred WebP data URI.
+    Works on a small sample, so JPEGs are only decoded at reduced scale.
+    """
+    width, height = image_size(source)
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        img.draft("RGB", (64, 64))  # JPEG: let the decoder downscale by up to 8x
+        sample = to_rgb(ImageOps.exif_transpose(img))
+    sample.thumbnail((64, 64), Image.Resampling.BILINEAR)
+
+    # Octree quantisation runs in C over the whole sample; the most common
+    # palette entry is the dominant colour
+    quantized = sample.quantize(colors=8, method=Image.Quantize.FASTOCTREE)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+
+    size = settings.IMAGE_PLACEHOLDER_SIZE
+    tiny = sample.copy()
+    tiny.thumbnail((size, size), Image.Resampling.LANCZOS)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    out = io.BytesIO()
+    tiny.save(out, "WEBP", quality=40)
+
+    return {
+        "width": width,
+        "height": height,
+        "dominant_color": f"#{r:02x}{g:02x}{b:02x}",
+        "placeholder": "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode("ascii"),
+    }
+
+
+def target_widths(width: int, ladder: List[int]) -> List[int]:
+    """
+    Ladder widths to render for an image `width` pixels wide.
+    Never upscales; an image narrower than the top of the ladder also gets
+    a copy at its own width so the srcset covers its full resolution.
+    """
+    widths = [w for w in ladder if w < width]
+    if not ladder or width <= ladder[-1]:
+        widths.append(width)
+    return widths
+
+
+def render_derivatives(
+    source: Union[bytes, str],
+    widths: Optional[List[int]] = None,
+    formats: Optional[List[str]] = None,
+    quality: Optional[int] = None,
+) -> Tuple[int, int, List[Derivative]]:
+    """
+    Build the responsive derivative ladder for an uploaded image.
+
+    Args:
+        source: Original image bytes, or a path to it
+        widths: Target widths (defaults to IMAGE_DERIVATIVE_WIDTHS)
+        formats: Output formats (defaults to IMAGE_DERIVATIVE_FORMATS)
+        quality: Encoder quality (defaults to IMAGE_QUALITY)
+
+    Returns:
+        (original width, original height, derivatives) — dimensions are
+        after EXIF orientation has been applied
+    """
+    widths = settings.image_derivative_widths if widths is None else sorted(widths)
+    formats = settings.image_derivative_formats if formats is None else formats
+    quality = settings.IMAGE_QUALITY if quality is None else quality
+
+    img = load_image(source)
+    derivatives = []
+    for width in target_widths(img.width, widths):
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize(
+            (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+        )
+        for fmt in formats:
+            if fmt in FORMATS:
+                derivatives.append(Derivative(width, height, fmt, encode_image(resized, fmt, quality)))
+    return img.width, img.height, derivatives
+
+
+def render_variant(data: bytes, width: int, fmt: str, quality: int) -> Derivative:
+    """Render a single derivative, never wider than the original."""
+    img = load_image(data)
+    width = min(width, img.width)
+    height = max(1, round(img.height * width / img.width))
+    if width != img.width:
+        img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return Derivative(width, height, fmt, encode_image(img, fmt, quality))
+
+
+def snap_width(width: int, ladder: List[int]) -> int:
+    """Round a requested width up to the nearest ladder step (capped at the largest)."""
+    for step in ladder:
+        if step >= width:
+            return step
+    return ladder[-1]
+
+
+def snap_quality(quality: int) -> int:
+    """Clamp quality to 30–95 in steps of 5 to bound the number of variants."""
+    return min(95, max(30, int(5 * round(quality / 5))))
+
+
+def derivative_key(key: str, width: int, fmt: str, quality: Optional[int] = None) -> str:
+    """
+    Storage key of a derivative: "projects/abc.png" -> "projects/abc-640w.webp".
+    A non-default quality is part of the key ("projects/abc-640w-q60.webp").
+    """
+    stem = key.rsplit(".", 1)[0] if "." in key.rsplit("/", 1)[-1] else key
+    suffix = f"-q{quality}" if quality is not None and quality != settings.IMAGE_QUALITY else ""
+    return f"{stem}-{width}w{suffix}.{FORMATS[fmt][1]}"
+
+
+def optimize_bytes(data: bytes, max_width: int, quality: int) -> bytes:
+    """
+    Resize an image to at most `max_width` and recompress it in its own
+    format, dropping EXIF after applying its orientation.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        fmt = (original.format or "JPEG").upper()
+    img = load_image(data)
+
+    if img.width > max_width:
+        new_height = int(img.height * max_width / img.width)
+        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    options = {"optimize": True}
+    if fmt in ("JPEG", "WEBP"):
+        options["quality"] = quality
+    if img.info.get("icc_profile"):
+        options["icc_profile"] = img.info["icc_profile"]
+    out = io.BytesIO()
+    img.save(out, fmt, **options)
+    return out.getvalue()
+
+
+def optimize_file(full_path: str, max_width: int, quality: int) -> None:
+    """Resize and recompress an image file in place (see `optimize_bytes`)."""
+    with open(full_path, "rb") as f:
+        data = f.read()
+    optimized = optimize_bytes(data, max_width, quality)
+    with open(full_path, "wb") as f:
+        f.write(optimized)
@@ -0,0 +1,228 @@
+import logging
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Set
+from urllib.parse import urlsplit
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.blog import BlogPost
+from app.models.media import MediaAsset
+from app.models.project import Project, ProjectImage
+from app.models.service import Service
+from app.storage import get_storage
+
+logger = logging.getLogger("entourage.media")
+
+# Every column that stores an image reference. Values are whatever the admin
+# panel saved: a media proxy URL, a /static/ URL or a bare storage key.
+REFERENCE_COLUMNS = [
+    Project.image,
+    Project.thumbnail_image,
+    ProjectImage.before_image,
+    ProjectImage.after_image,
+    BlogPost.image,
+    Service.image,
+]
+
+# URL path segments that are followed by a storage key
+_KEY_MARKERS = ("/api/v1/upload/media/", "/static/")
+
+# "-640w" / "-640w-q60" suffix of a derivative key (see images.derivative_key)
+_DERIVATIVE_SUFFIX = re.compile(r"-\d+w(-q\d+)?$")
+
+
+def media_key(ref: Optional[str]) -> Optional[str]:
+    """
+    Extract the storage key from an image reference.
+
+    "https://api.example.com/api/v1/upload/media/media/ab12.jpg?w=640" and
+    "/static/media/ab12.jpg" both give "media/ab12.jpg". External URLs give None.
+    """
+    if not ref or not ref.strip():
+        return None
+    ref = ref.strip()
+    path = urlsplit(ref).path
+    for marker in _KEY_MARKERS:
+        idx = path.find(marker)
+        if idx != -1:
+            return path[idx + len(marker):] or None
+    if "://" in ref:
+        return None
+    return path.lstrip("/") or None
+
+
+def count_references(db: Session, key: str) -> int:
+    """
+    Count project/blog/service rows whose image columns point at `key`.
+
+    Args:
+        db: Database session
+        key: Storage key
+
+    Returns:
+        Number of referencing column values (0 means the object is unused)
+    """
+    total = 0
+    for column in REFERENCE_COLUMNS:
+        conditions = [column == key]
+        for marker in _KEY_MARKERS:
+            conditions.append(column.like(f"%{marker}{key}"))
+            conditions.append(column.like(f"%{marker}{key}?%"))
+        total += db.query(column).filter(or_(*conditions)).count()
+    return total
+
+
+def sync_image_meta(db: Session, obj) -> None:
+    """
+    Copy placeholder metadata for every image field of `obj` from the media
+    registry into `obj.image_meta`, keyed by field name, so responses can
+    return it without extra queries. Models opt in with `__image_fields__`.
+    Does not commit.
+    """
+    fields = getattr(type(obj), "__image_fields__", ())
+    if not fields:
+        return
+    keys = {field: media_key(getattr(obj, field)) for field in fields}
+    wanted = {key for key in keys.values() if key}
+    assets = {}
+    if wanted:
+        assets = {a.key: a for a in db.query(MediaAsset).filter(MediaAsset.key.in_(wanted)).all()}
+    meta = {field: assets[key].meta() for field, key in keys.items() if key in assets}
+    obj.image_meta = meta or None
+
+
+def refresh_image_meta(db: Session, keys: Iterable[str]) -> int:
+    """
+    Re-copy registry metadata into `image_meta` on every row that references
+    one of `keys`, e.g. after the objects were re-encoded. Scans the (small)
+    content tables in full. Does not commit.
+
+    Returns:
+        Number of rows updated
+    """
+    keys = set(keys)
+    updated = 0
+    for model in (Project, ProjectImage, BlogPost, Service):
+        for obj in db.query(model).all():
+            if {media_key(getattr(obj, field)) for field in model.__image_fields__} & keys:
+                sync_image_meta(db, obj)
+                updated += 1
+    return updated
+
+
+def media_keys(obj) -> Set[str]:
+    """
+    Storage keys referenced by `obj`'s image fields and, for models that
+    declare `__image_relations__` (a project's image pairs), by its children.
+    """
+    keys = {media_key(getattr(obj, field)) for field in getattr(type(obj), "__image_fields__", ())}
+    for relation in getattr(type(obj), "__image_relations__", ()):
+        for child in getattr(obj, relation):
+            keys |= media_keys(child)
+    keys.discard(None)
+    return keys
+
+
+def update_ref_counts(db: Session, keys: Iterable[str]) -> None:
+    """
+    Recount references for registered assets among `keys`, e.g. the old and
+    new keys of a row whose image fields changed. Does not commit; pending
+    changes are flushed first so they are counted.
+    """
+    keys = {k for k in keys if k}
+    if not keys:
+        return
+    db.flush()
+    for asset in db.query(MediaAsset).filter(MediaAsset.key.in_(keys)).all():
+        asset.ref_count = count_references(db, asset.key)
+
+
+def referenced_keys(db: Session) -> Counter:
+    """Every storage key referenced by any image column, with its reference count."""
+    counts = Counter()
+    for column in REFERENCE_COLUMNS:
+        for (value,) in db.query(column).filter(column.isnot(None)):
+            key = media_key(value)
+            if key:
+                counts[key] += 1
+    return counts
+
+
+def original_stem(key: str) -> str:
+    """
+    Key without its extension or derivative suffix, shared by an original
+    and all of its derivatives: "media/ab12-640w.webp" -> "media/ab12".
+    """
+    name = key.rsplit("/", 1)[-1]
+    stem = key.rsplit(".", 1)[0] if "." in name else key
+    return _DERIVATIVE_SUFFIX.sub("", stem)
+
+
+def collect_garbage(
+    db: Session,
+    *,
+    prefix: str = "media/",
+    grace: timedelta = timedelta(hours=24),
+    dry_run: bool = False,
+) -> dict:
+    """
+    Delete stored objects that no project, blog post or service references.
+
+    The bucket listing under `prefix` is diffed against every referencing
+    column; an object survives if its original (or any derivative of it) is
+    referenced. Objects younger than `grace` are kept so uploads that are
+    not yet attached to a row are not collected. Deletes go out in batches
+    of 1000 keys per `delete_objects` call; registry rows for deleted keys
+    are removed and every remaining ref_count is reconciled.
+
+    Args:
+        db: Database session
+        prefix: Only consider keys under this prefix
+        grace: Minimum object age before it can be collected
+        dry_run: Report what would be deleted without deleting anything
+
+    Returns:
+        Counts of scanned, garbage and deleted objects and bytes freed
+    """
+    storage = get_storage()
+    counts = referenced_keys(db)
+    live_stems = {original_stem(key) for key in counts}
+    cutoff = datetime.now(timezone.utc) - grace
+
+    scanned = 0
+    garbage = {}
+    for info in storage.list(prefix):
+        scanned += 1
+        if original_stem(info.key) in live_stems:
+            continue
+        modified = info.last_modified
+        if modified is not None and modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        if modified is not None and modified > cutoff:
+            continue
+        garbage[info.key] = info.size
+
+    deleted = []
+    failed = []
+    if garbage and not dry_run:
+        failed = storage.delete_many(garbage)
+        deleted = [key for key in garbage if key not in set(failed)]
+        for start in range(0, len(deleted), 1000):
+            db.query(MediaAsset)\
+                .filter(MediaAsset.key.in_(deleted[start:start + 1000]))\
+                .delete(synchronize_session=False)
+        for asset in db.query(MediaAsset).all():
+            asset.ref_count = counts.get(asset.key, 0)
+        db.commit()
+        logger.info(f"Media GC deleted {len(deleted)} objects under '{prefix}'")
+
+    return {
+        "scanned": scanned,
+        "referenced": len(counts),
+        "garbage": len(garbage),
+        "deleted": len(deleted),
+        "failed": failed,
+        "bytes_freed": sum(garbage[key] for key in deleted),
+        "dry_run": dry_run,
+    }
@@ -0,0 +1,212 @@
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.media import MediaAsset
+from app.storage import get_storage, ObjectInfo, StorageBackend, StorageError
+from app.utils.cache import TTLCache
+from app.utils.media import count_references, original_stem
+
+logger = logging.getLogger("entourage.media")
+
+# Keys gathered into one cleanup pass; storage splits deletes per 1000 keys
+CLEANUP_BATCH_SIZE = 1000
+
+
+class MediaCleanup:
+    """
+    Background deletion of media left behind by deleted rows.
+
+    `enqueue()` returns immediately; a single worker thread drains the queue,
+    coalescing everything pending into one pass. Each pass re-checks that no
+    row references a key any more (uploads are deduplicated, so another row
+    may share it), then removes the originals together with every stored
+    derivative (any width, format or -qNN quality) through `delete_many` —
+    one S3 `delete_objects` call per 1000 keys — and drops their
+    media_assets rows. Derivatives are found with one listing per
+    directory in the pass, not one per key.
+
+    Like `collect_garbage`, nothing younger than MEDIA_GC_GRACE_HOURS is
+    deleted: not an object registered or written within the window, and
+    not a key an upload handed out within it (see `hold`), since a
+    deduplicated upload returns an old key that a row is about to save.
+    Skipped keys are left to the periodic `gc_media.py` run.
+    """
+
+    def __init__(self, grace: Optional[timedelta] = None):
+        self.grace = grace if grace is not None else timedelta(hours=settings.MEDIA_GC_GRACE_HOURS)
+        # Keys recently returned by an upload, which a row may be about to reference
+        self._held = TTLCache(maxsize=100_000, ttl=self.grace.total_seconds())
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.deleted = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="media-cleanup", daemon=True
+                    )
+                    self._thread.start()
+
+    def hold(self, key: str) -> None:
+        """Protect `key` from cleanup for the grace period, e.g. after an upload returned it."""
+        self._held.set(key, True)
+
+    def enqueue(self, keys: Iterable[str]) -> None:
+        """Schedule `keys` (originals) for deletion once nothing references them."""
+        keys = tuple(k for k in keys if k)
+        if not keys:
+            return
+        self._ensure_worker()
+        with self._lock:
+            self.pending += len(keys)
+        self._queue.put(keys)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = set(item)
+            stop = False
+            # Fold in everything else already waiting
+            while len(batch) < CLEANUP_BATCH_SIZE:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                batch.update(more)
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Media cleanup failed for {len(batch)} keys: {e}")
+                with self._lock:
+                    self.failed += len(batch)
+            finally:
+                with self._lock:
+                    self.pending = max(0, self.pending - len(batch))
+            if stop:
+                return
+
+    @staticmethod
+    def _is_recent(stamp: Optional[datetime], cutoff: datetime) -> bool:
+        if stamp is None:
+            return False
+        if stamp.tzinfo is None:
+            stamp = stamp.replace(tzinfo=timezone.utc)
+        return stamp > cutoff
+
+    @staticmethod
+    def _list_objects(storage: StorageBackend, originals: Iterable[str]) -> Dict[str, List[ObjectInfo]]:
+        """
+        Stored objects of each original (itself plus every derivative),
+        found with one listing per directory instead of one per key.
+        """
+        by_stem = {original_stem(key): key for key in originals}
+        directories = {key.rsplit("/", 1)[0] + "/" if "/" in key else "" for key in by_stem.values()}
+        found: Dict[str, List[ObjectInfo]] = {key: [] for key in by_stem.values()}
+        for directory in sorted(directories):
+            for info in storage.list(directory):
+                stem = original_stem(info.key)
+                original = by_stem.get(stem)
+                # The original itself, or a derivative (never another original sharing the stem)
+                if original is not None and (info.key == original or info.key.rsplit(".", 1)[0] != stem):
+                    found[original].append(info)
+        return found
+
+    def _process(self, keys: set) -> None:
+        db = SessionLocal()
+        try:
+            cutoff = datetime.now(timezone.utc) - self.grace
+            orphans = [key for key in keys if count_references(db, key) == 0]
+            registered = dict(
+                db.query(MediaAsset.key, MediaAsset.created_at).filter(MediaAsset.key.in_(orphans)).all()
+            ) if orphans else {}
+            orphans = [
+                key for key in orphans
+                if not self._held.get(key) and not self._is_recent(registered.get(key), cutoff)
+            ]
+            if not orphans:
+                with self._lock:
+                    self.skipped += len(keys)
+                return
+
+            storage = get_storage()
+            try:
+                stored = self._list_objects(storage, orphans)
+                orphans = [
+                    key for key in orphans
+                    if not any(info.key == key and self._is_recent(info.last_modified, cutoff) for info in stored[key])
+                ]
+                targets = []
+                for key in orphans:
+                    targets.append(key)
+                    targets.extend(info.key for info in stored[key] if info.key != key)
+                failed = set(storage.delete_many(targets)) if targets else set()
+            except StorageError as e:
+                logger.error(f"Media cleanup could not delete {len(orphans)} objects: {e}")
+                with self._lock:
+                    self.failed += len(orphans)
+                return
+
+            removed = [key for key in orphans if key not in failed]
+            if removed:
+                db.query(MediaAsset)\
+                    .filter(MediaAsset.key.in_(removed))\
+                    .delete(synchronize_session=False)
+                db.commit()
+
+            logger.info(f"Media cleanup removed {len(removed)} objects ({len(targets)} keys incl. derivatives)")
+            with self._lock:
+                self.deleted += len(removed)
+                self.failed += len(orphans) - len(removed)
+                self.skipped += len(keys) - len(orphans)
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "deleted": self.deleted,
+                "skipped": self.skipped,
+                "failed": self.failed,
+            }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Let the worker finish what is queued, waiting at most `timeout` seconds."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_cleanup: Optional[MediaCleanup] = None
+_cleanup_lock = threading.Lock()
+
+
+def get_media_cleanup() -> MediaCleanup:
+    """Return the process-wide cleanup queue (its worker thread starts lazily)."""
+    global _cleanup
+    if _cleanup is None:
+        with _cleanup_lock:
+            if _cleanup is None:
+                _cleanup = MediaCleanup()
+    return _cleanup
+
+
+def shutdown_media_cleanup() -> None:
+    if _cleanup is not None:
+        _cleanup.shutdown()
@@ -0,0 +1,146 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+from urllib.parse import urlencode
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+from app.core.config import settings
+
+# Response headers carrying page metadata; the CORS middleware exposes them
+PAGE_HEADERS = ("Link", "X-Next-Cursor", "X-Total-Count", "X-Total-Estimate")
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort-key values of the last row on a page."""
+    plain = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """
+    Sort-key values from a cursor made by `encode_cursor`, converted back
+    to the columns' Python types.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or does not match `columns`
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        plain = json.loads(raw)
+        if not isinstance(plain, list) or len(plain) != len(columns):
+            raise ValueError("wrong number of values")
+        values = []
+        for value, column in zip(plain, columns):
+            kind = column.type.python_type
+            if value is None:
+                values.append(None)
+            elif kind is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif kind is date:
+                values.append(date.fromisoformat(value))
+            else:
+                values.append(kind(value))
+        return tuple(values)
+    except (binascii.Error, ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _planner_estimate(db: Session, query: Query) -> Optional[int]:
+    """Row estimate from the PostgreSQL planner, or None on other databases."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+    (plan,) = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    return int(plan["Plan"]["Plan Rows"])
+
+
+def count_total(db: Session, query: Query) -> tuple:
+    """
+    Row count for `query`, exact while the planner expects at most
+    PAGINATION_EXACT_COUNT_LIMIT rows and the planner's estimate above
+    that, so a total never costs a full scan of a large table.
+
+    Returns:
+        (count, is_estimate)
+    """
+    estimate = _planner_estimate(db, query)
+    if estimate is not None and estimate > settings.PAGINATION_EXACT_COUNT_LIMIT:
+        return estimate, True
+    return query.order_by(None).count(), False
+
+
+def keyset_page(
+    db: Session,
+    query: Query,
+    columns: Sequence,
+    *,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    with_total: bool = False,
+) -> Page:
+    """
+    One page of `query` ordered by `columns` (the last one unique, e.g. id).
+
+    Rows after the cursor are selected with a row-value comparison on the
+    sort key, which an index on `columns` answers with a seek, so every
+    page costs the same however deep it is.
+
+    Args:
+        db: Database session
+        query: Filtered query, without ORDER BY / OFFSET / LIMIT
+        columns: Sort-key columns
+        descending: Sort newest / highest first
+        cursor: Cursor from the previous page's next_cursor
+        limit: Page size
+        with_total: Also count the rows matching `query`
+
+    Returns:
+        The page, with a next_cursor when more rows follow
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    total, estimated = count_total(db, query) if with_total else (None, False)
+    key = tuple_(*columns)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+    order = [c.desc() if descending else c.asc() for c in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+    return Page(rows, next_cursor, total, estimated)
+
+
+def set_page_headers(request: Request, response: Response, page: Page) -> None:
+    """
+    Describe `page` in response headers so the body stays a plain list:
+    X-Next-Cursor and a relative Link rel="next" when more rows follow,
+    and X-Total-Count (exact) or X-Total-Estimate when a total was asked for.
+    """
+    if page.next_cursor:
+        params = [(k, v) for k, v in request.query_params.multi_items() if k != "cursor"]
+        params.append(("cursor", page.next_cursor))
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        response.headers["Link"] = f'<{request.url.path}?{urlencode(params)}>; rel="next"'
+    if page.total is not None:
+        name = "X-Total-Estimate" if page.total_is_estimate else "X-Total-Count"
+        response.headers[name] = str(page.total)
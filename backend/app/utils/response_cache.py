@@ -0,0 +1,308 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.core.config import settings
+from app.utils.conditional import table_validator, validator_headers
+from app.utils.http import is_not_modified
+
+# Key in Session.info collecting the tables written since the last commit
+_SESSION_TAGS = "response_cache_tags"
+# Key in the request scope state holding the collection validator of a miss
+_STATE_VALIDATOR = "response_cache_validator"
+
+
+class ResponseCache:
+    """
+    In-process LRU of serialised JSON responses, bounded by total body size.
+
+    Entries are tagged with the tables they were built from; committing a
+    write to one of those tables (see the session hooks below) drops every
+    entry carrying its tag. Each tag has a version counter so a response
+    computed from rows that were changed while it was being built is not
+    stored. Scope is a single worker process; `ttl` bounds how stale an
+    entry can get when another process writes to the database.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (body, headers, tags, route, expires_at)
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        self._versions: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _count(self, route: str, outcome: str) -> None:
+        counters = self._routes.setdefault(route, {"hits": 0, "misses": 0, "not_modified": 0})
+        counters[outcome] += 1
+
+    def _drop(self, key: Hashable) -> None:
+        body, _, tags, _, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+
+    def get(self, key: Hashable, route: str) -> Optional[Tuple[bytes, dict]]:
+        """Cached (body, headers) for `key`, counting a hit or miss against `route`."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[4] <= time.monotonic():
+                self._drop(key)
+                item = None
+            if item is None:
+                self._count(route, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._count(route, "hits")
+            return item[0], item[1]
+
+    def count_not_modified(self, route: str) -> None:
+        with self._lock:
+            self._count(route, "not_modified")
+
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the tag versions, taken before building a response."""
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def put(
+        self,
+        key: Hashable,
+        route: str,
+        body: bytes,
+        headers: dict,
+        tags: Tuple[str, ...],
+        versions: Tuple[int, ...],
+    ) -> bool:
+        """
+        Store `body` unless one of its tags was invalidated since `versions`
+        was taken or it is larger than the whole budget. Evicts least
+        recently used entries to make room.
+
+        Returns:
+            True if the body was stored
+        """
+        if len(body) > self.max_bytes:
+            return False
+        with self._lock:
+            if tuple(self._versions.get(tag, 0) for tag in tags) != versions:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (body, headers, tags, route, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+            return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry tagged with any of `tags`.
+
+        Returns:
+            Number of entries dropped
+        """
+        dropped = 0
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in list(self._by_tag.pop(tag, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        dropped += 1
+            self._invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            for tag in self._by_tag:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "routes": {route: dict(counters) for route, counters in sorted(self._routes.items())},
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL)
+    return _cache
+
+
+# ── Write-driven invalidation ──────────────────────────────────────────────────
+# Tags are table names. Every ORM flush and bulk UPDATE/DELETE records the
+# tables it touched on the session; they are invalidated once the commit
+# succeeds and forgotten on rollback. This covers CRUDBase, the custom CRUD
+# methods and the routes that write with db.add()/db.commit() directly.
+
+def _pending_tags(session: Session) -> Set[str]:
+    return session.info.setdefault(_SESSION_TAGS, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session, flush_context):
+    tags = _pending_tags(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(obj), "__tablename__", None)
+        if table:
+            tags.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_writes(state):
+    if state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        name = getattr(table, "name", None)
+        if name:
+            _pending_tags(state.session).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop(_SESSION_TAGS, None)
+    if tags and _cache is not None:
+        _cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_SESSION_TAGS, None)
+
+
+# ── Route integration ──────────────────────────────────────────────────────────
+
+def cache_response(*tags: str) -> Callable:
+    """
+    Mark a public GET endpoint as cacheable. `tags` are the tables its
+    response is built from. Only takes effect on routers created with
+    `route_class=CachedRoute`; place it below the @router.get decorator.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__cache_tags__ = tuple(tags)
+        return endpoint
+    return decorator
+
+
+def _validator_dependency(tags: Tuple[str, ...]) -> Callable:
+    """
+    Route dependency computing the collection validator on a cache miss.
+
+    It reads `get_db`, which FastAPI resolves once per request, so the
+    validator comes from the same session (and pooled connection) the
+    endpoint then builds its body with. A matching If-None-Match is
+    answered with a 304 before the endpoint's query runs.
+    """
+    def check(request: Request, db: Session = Depends(get_db)) -> None:
+        validator = table_validator(db, tags)
+        setattr(request.state, _STATE_VALIDATOR, validator)
+        if is_not_modified(request.headers, validator.etag, None):
+            raise HTTPException(status_code=304, headers=validator_headers(validator))
+    check.__cache_validator__ = True
+    return check
+
+
+class CachedRoute(APIRoute):
+    """
+    APIRoute that serves endpoints marked with @cache_response
+    conditionally and from the response cache.
+
+    Responses carry an ETag built from the row count and newest change
+    time of the tagged tables (see utils.conditional). Lookups go:
+      - Cache hit: the stored ETag answers If-None-Match with a 304, or
+        the stored body is returned. No database work either way.
+      - Miss: the cheap table validator, read through the request's own
+        session, answers a matching If-None-Match with a 304 before the
+        endpoint's query runs.
+      - Otherwise the endpoint runs and its 200 body is stored.
+    The cache key is the request path plus its sorted query parameters.
+    Responses carry X-Cache: HIT or MISS.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        tags = getattr(endpoint, "__cache_tags__", None)
+        dependencies = list(kwargs.get("dependencies") or ())
+        # include_router() rebuilds the route with the dependencies it already has
+        included = any(getattr(d.dependency, "__cache_validator__", False) for d in dependencies)
+        if tags and not included and "GET" in (kwargs.get("methods") or ()):
+            # Runs after the router's own dependencies (e.g. require_admin)
+            kwargs["dependencies"] = [*dependencies, Depends(_validator_dependency(tags))]
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tags = getattr(self.endpoint, "__cache_tags__", None)
+        if not tags:
+            return handler
+        route = self.path
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            cache = get_response_cache()
+
+            key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+            entry = cache.get(key, route) if cache.enabled else None
+            if entry is not None:
+                body, headers = entry
+                if is_not_modified(request.headers, headers["etag"], None):
+                    cache.count_not_modified(route)
+                    return Response(status_code=304, headers=headers)
+                return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+            versions = cache.versions(tags)
+            try:
+                response = await handler(request)
+            except HTTPException as e:
+                if e.status_code != 304:
+                    raise
+                cache.count_not_modified(route)
+                return Response(status_code=304, headers=e.headers)
+            validator = getattr(request.state, _STATE_VALIDATOR, None)
+            if response.status_code == 200 and validator is not None:
+                response.headers.update(validator_headers(validator))
+                if cache.enabled and response.background is None:
+                    # Validator and page headers (Link, X-Next-Cursor, ...) are replayed on hits
+                    headers = {
+                        name: value for name, value in response.headers.items()
+                        if name not in ("content-length", "content-type")
+                    }
+                    cache.put(key, route, bytes(response.body), headers, tags, versions)
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return cached_handler
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key starts `fn` in a task of its own; everyone
+    who arrives while it is still running awaits the same result (or
+    exception). Every caller, the first included, waits through a shield,
+    so a cancelled request (e.g. a client disconnect) only stops waiting
+    and never cancels the call the others depend on. Nothing is cached
+    once the call completes. Scope is a single worker process.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved so a failure nobody awaited is not logged
+
+    def __len__(self) -> int:
+        return len(self._calls)
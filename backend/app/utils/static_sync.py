@@ -0,0 +1,207 @@
+import hashlib
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.storage import LocalStorage, ObjectInfo, StorageBackend
+from app.utils.media import REFERENCE_COLUMNS, media_key
+
+logger = logging.getLogger("entourage.media")
+
+
+def local_etag(path: str, remote_etag: Optional[str]) -> str:
+    """
+    ETag S3 would report for the file at `path`. Plain uploads get the MD5
+    of the body; multipart uploads ("<md5>-<parts>") get the MD5 of the
+    part MD5s, using the S3_MULTIPART_CHUNKSIZE parts we upload with.
+    """
+    multipart = remote_etag is not None and "-" in remote_etag.strip('"')
+    whole = hashlib.md5()
+    parts = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(settings.S3_MULTIPART_CHUNKSIZE)
+            if not chunk:
+                break
+            whole.update(chunk)
+            if multipart:
+                parts.append(hashlib.md5(chunk).digest())
+    if multipart:
+        combined = hashlib.md5(b"".join(parts)).hexdigest()
+        return f'"{combined}-{len(parts)}"'
+    return f'"{whole.hexdigest()}"'
+
+
+@dataclass
+class SyncReport:
+    scanned: int = 0
+    uploaded: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    bytes_uploaded: int = 0
+    bytes_scanned: int = 0
+    rewritten: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed or 1e-9
+        return {
+            "scanned": self.scanned,
+            "uploaded": self.uploaded,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "bytes_uploaded": self.bytes_uploaded,
+            "rewritten_references": self.rewritten,
+            "elapsed_s": round(self.elapsed, 2),
+            "files_per_s": round((self.uploaded + self.unchanged) / elapsed, 2),
+            "mb_per_s": round(self.bytes_uploaded / elapsed / 1024 / 1024, 2),
+            "errors": self.errors[:20],
+        }
+
+
+def _sync_one(
+    local: LocalStorage, remote: StorageBackend, info: ObjectInfo, existing: Optional[ObjectInfo], dry_run: bool
+) -> Tuple[str, Optional[str]]:
+    """Upload one file unless the bucket already has identical bytes. Returns (status, error)."""
+    try:
+        if existing is not None and existing.size == info.size:
+            if local_etag(local.path(info.key), existing.etag) == existing.etag:
+                return "unchanged", None
+        if not dry_run:
+            remote.save_file(info.key, local.path(info.key), info.content_type)
+        return "uploaded", None
+    except Exception as e:
+        return "failed", str(e)
+
+
+def sync_static(
+    local: LocalStorage,
+    remote: StorageBackend,
+    *,
+    prefix: str = "",
+    jobs: int = 16,
+    dry_run: bool = False,
+    report: Optional[SyncReport] = None,
+    progress: Optional[Callable[[SyncReport], None]] = None,
+    progress_every: float = 2.0,
+) -> Set[str]:
+    """
+    Copy the local static/ tree into the bucket under the same keys.
+
+    The bucket is listed once (paginated) under `prefix`. A file whose
+    size and MD5/ETag already match the object is not uploaded again.
+    Uploads run on `jobs` threads with at most 2 x `jobs` files in
+    flight, so memory stays flat however many files there are.
+
+    Args:
+        local: Source (static/)
+        remote: Destination bucket
+        prefix: Only sync keys under this prefix
+        jobs: Upload threads
+        dry_run: Compare but upload nothing
+        report: Report to fill in (a new one by default)
+        progress: Called with the running report every `progress_every` seconds
+
+    Returns:
+        Keys that are now (or, in a dry run, would be) present in the bucket
+    """
+    report = report or SyncReport()
+    started = time.monotonic()
+    last_progress = started
+    remote_index: Dict[str, ObjectInfo] = {info.key: info for info in remote.list(prefix)}
+    synced: Set[str] = set()
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="static-sync") as pool:
+        pending: Dict[Future, ObjectInfo] = {}
+
+        def drain(block: bool) -> None:
+            nonlocal last_progress
+            if not pending:
+                return
+            done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                info = pending.pop(future)
+                status, error = future.result()
+                if status == "failed":
+                    report.failed += 1
+                    report.errors.append(f"{info.key}: {error}")
+                    logger.warning(f"Static sync failed for {info.key}: {error}")
+                    continue
+                synced.add(info.key)
+                if status == "unchanged":
+                    report.unchanged += 1
+                else:
+                    report.uploaded += 1
+                    report.bytes_uploaded += info.size
+            now = time.monotonic()
+            if progress and now - last_progress >= progress_every:
+                report.elapsed = now - started
+                progress(report)
+                last_progress = now
+
+        for info in local.list(prefix):
+            if info.key.rsplit("/", 1)[-1].startswith("."):
+                continue  # .DS_Store, .gitkeep and friends
+            report.scanned += 1
+            report.bytes_scanned += info.size
+            while len(pending) >= jobs * 2:
+                drain(block=True)
+            future = pool.submit(_sync_one, local, remote, info, remote_index.get(info.key), dry_run)
+            pending[future] = info
+            drain(block=False)
+        while pending:
+            drain(block=True)
+
+    report.elapsed = time.monotonic() - started
+    return synced
+
+
+def rewrite_static_references(
+    db: Session,
+    keys: Set[str],
+    to_reference: Callable[[str], str],
+    *,
+    dry_run: bool = False,
+    batch_size: int = 500,
+) -> int:
+    """
+    Point image columns that hold /static/... URLs at the synced objects.
+
+    Every distinct /static/ value whose key is in `keys` is replaced with
+    `to_reference(key)`. Replacements go out as executemany UPDATE batches
+    of `batch_size` values per column. Values whose file was not synced are
+    left alone.
+
+    Returns:
+        Number of rows updated (or, in a dry run, that would be)
+    """
+    total = 0
+    for column in REFERENCE_COLUMNS:
+        table = column.class_.__table__
+        col = table.c[column.key]
+        changes = []
+        for (value,) in db.query(column).filter(column.like("%/static/%")).distinct():
+            key = media_key(value)
+            if "/static/" in urlsplit(value).path and key in keys:
+                changes.append({"old_ref": value, "new_ref": to_reference(key)})
+        if not changes:
+            continue
+
+        stmt = update(table).where(col == bindparam("old_ref")).values({col.name: bindparam("new_ref")})
+        for start in range(0, len(changes), batch_size):
+            batch = changes[start:start + batch_size]
+            total += db.query(column).filter(column.in_([c["old_ref"] for c in batch])).count()
+            if not dry_run:
+                db.execute(stmt, batch)
+        if not dry_run:
+            logger.info(f"Rewrote {len(changes)} /static/ references in {table.name}.{col.name}")
+
+    if not dry_run:
+        db.commit()
+    return total
@@ -0,0 +1,104 @@
+"""
+Re-optimise media stored before uploads were optimised.
+Usage: python backfill_media.py [--source all|local|s3] [--prefix projects/]
+                                [--workers 4] [--jobs 8] [--max-width 1920]
+                                [--quality 85] [--manifest backfill-manifest.json]
+                                [--dry-run]
+
+Walks the local static/ tree and/or the S3 bucket (paginated
+list_objects_v2). For every original image, the Pillow work runs in a
+process pool, and three things happen:
+  - The image is re-encoded in its own format, downscaled to --max-width.
+  - The result replaces the stored original under the same key, so
+    existing URLs keep working. This only happens when it saves at least
+    --min-savings.
+  - The responsive derivative ladder is regenerated next to it.
+The media registry and image_meta columns are refreshed for objects in the
+backend the app serves from.
+
+Progress is recorded in a checksum manifest (ETag + SHA-256 per object),
+so an interrupted run resumes where it stopped and a repeat run skips
+finished objects. Delete the manifest, or change the output settings, to
+process everything again.
+"""
+
+import argparse
+import json
+import os
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.storage import LocalStorage, S3Storage
+from app.utils.backfill import BackfillReport, Manifest, backfill
+from app.utils.image_executor import ImageExecutor
+
+
+def mb(n: int) -> str:
+    return f"{n / 1024 / 1024:.1f} MB"
+
+
+def print_progress(report: BackfillReport) -> None:
+    r = report.as_dict()
+    print(
+        f"… {r['processed']} processed, {r['skipped']} skipped, {r['failed']} failed | "
+        f"{mb(r['bytes_saved'])} saved in place, {mb(r['bytes_saved_served'])} when served | "
+        f"{r['objects_per_s']} obj/s, {r['mb_per_s']} MB/s",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", choices=["all", "local", "s3"], default="all")
+    parser.add_argument("--prefix", default="", help="only consider keys under this prefix")
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_WORKERS or os.cpu_count() or 1,
+                        help="image worker processes")
+    parser.add_argument("--jobs", type=int, default=8, help="download/upload threads")
+    parser.add_argument("--max-width", type=int, default=1920)
+    parser.add_argument("--quality", type=int, default=85)
+    parser.add_argument("--min-savings", type=float, default=0.05,
+                        help="replace an original only if re-encoding saves this fraction")
+    parser.add_argument("--manifest", default="backfill-manifest.json")
+    parser.add_argument("--dry-run", action="store_true", help="process but write nothing")
+    args = parser.parse_args()
+
+    sources = []
+    if args.source in ("all", "local"):
+        sources.append(("local", LocalStorage()))
+    if args.source in ("all", "s3"):
+        if not settings.use_s3:
+            parser.error("S3 is not configured")
+        sources.append(("s3", S3Storage()))
+
+    executor = ImageExecutor(workers=args.workers, queue_size=0)
+    db = SessionLocal()
+    try:
+        report = backfill(
+            sources,
+            Manifest(args.manifest),
+            executor,
+            db=db,
+            registry_source="s3" if settings.use_s3 else "local",
+            prefix=args.prefix,
+            jobs=args.jobs,
+            max_width=args.max_width,
+            quality=args.quality,
+            min_savings=args.min_savings,
+            dry_run=args.dry_run,
+            progress=print_progress,
+        )
+    finally:
+        db.close()
+        executor.shutdown()
+
+    result = report.as_dict()
+    print(json.dumps(result, indent=2))
+    prefix = "🔎 Dry run: would save" if args.dry_run else "✅ Saved"
+    print(f"{prefix} {mb(result['bytes_saved'])} of {mb(result['bytes_before'])} in place across "
+          f"{result['processed']} objects ({result['objects_per_s']} obj/s, {result['mb_per_s']} MB/s)")
+    print(f"   Full-width derivatives: {mb(result['full_width_bytes'])} "
+          f"({mb(result['bytes_saved_served'])} less per full-size view)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the S3 media proxy (GET /api/v1/upload/media/{key}).
+Usage: python bench_media.py KEY [--url http://localhost:8000] [--requests 500] [--concurrency 20]
+
+Requires httpx (pip install httpx). Works against any S3-compatible endpoint;
+to run fully offline, start a local stand-in and point the backend at it
+before launching uvicorn:
+
+  pip install "moto[server]" && moto_server -p 5000
+  export S3_ENDPOINT=http://localhost:5000 S3_BUCKET=bench \\
+         S3_ACCESS_KEY=test S3_SECRET_KEY=test S3_REGION=us-east-1
+  python bench_media.py --seed projects/bench.jpg --file static/projects/1313aed23ef6.jpg
+  uvicorn app.main:app --port 8000
+  python bench_media.py projects/bench.jpg
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+
+async def _worker(client: httpx.AsyncClient, url: str, todo: asyncio.Queue, latencies: list, errors: list):
+    while True:
+        try:
+            todo.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            resp = await client.get(url)
+            await resp.aread()
+            if resp.status_code >= 400:
+                errors.append(resp.status_code)
+        except httpx.HTTPError as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url: str, total: int, concurrency: int) -> None:
+    todo: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        todo.put_nowait(None)
+
+    latencies: list = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _worker(client, url, todo, latencies, errors) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"URL:          {url}")
+    print(f"Requests:     {total} ({len(errors)} errors), concurrency {concurrency}")
+    print(f"Throughput:   {total / elapsed:.1f} req/s")
+    print(f"Latency p50:  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95:  {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+
+
+def seed(key: str, path: str) -> None:
+    """Upload a sample object through the app's storage backend."""
+    import mimetypes
+    from app.storage import get_s3_client
+    from app.core.config import settings
+
+    s3 = get_s3_client()
+    try:
+        s3.create_bucket(Bucket=settings.S3_BUCKET)
+    except Exception:
+        pass  # already exists
+    with open(path, "rb") as f:
+        s3.put_object(Bucket=settings.S3_BUCKET, Key=key, Body=f.read(), ContentType=mimetypes.guess_type(path)[0] or "image/jpeg")
+    print(f"✅ Seeded s3://{settings.S3_BUCKET}/{key}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("key", nargs="?", help="media key to request, e.g. projects/abc.jpg")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", metavar="KEY", help="upload --file to KEY in the configured bucket and exit")
+    parser.add_argument("--file", help="local file used with --seed")
+    args = parser.parse_args()
+
+    if args.seed:
+        if not args.file:
+            parser.error("--seed requires --file")
+        seed(args.seed, args.file)
+        sys.exit(0)
+    if not args.key:
+        parser.error("KEY is required")
+
+    asyncio.run(run(f"{args.url.rstrip('/')}/api/v1/upload/media/{args.key}", args.requests, args.concurrency))
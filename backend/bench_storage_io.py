@@ -0,0 +1,102 @@
+"""
+Regression benchmark: concurrent media requests must not serialise on
+blocking storage calls.
+Usage: python bench_storage_io.py [--requests 20] [--latency 0.2]
+
+Runs the app in-process (no server, no bucket needed) with a storage
+backend that sleeps --latency seconds on every HEAD/GET, like a slow S3
+round trip, then fires --requests concurrent GETs at /api/v1/upload/media/.
+If storage calls block the event loop the requests queue up behind each
+other and the run takes about requests x latency; with non-blocking I/O it
+takes about one latency. Exits with status 1 when the requests serialise.
+
+Requires httpx (pip install httpx).
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="bench-storage-io-")
+# A throwaway database and fake S3 settings so the media route is enabled;
+# the disk cache is off so every request reaches the (slow) backend.
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_tmp}/bench.db",
+    S3_ENDPOINT="http://s3.invalid",
+    S3_BUCKET="bench",
+    S3_ACCESS_KEY="bench",
+    S3_SECRET_KEY="bench",
+    MEDIA_CACHE_MAX_BYTES="0",
+    UPLOAD_DIR=_tmp,
+)
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.storage import LocalStorage, set_storage  # noqa: E402
+
+KEY = "media/bench.jpg"
+
+
+class SlowStorage(LocalStorage):
+    """Local files behind an artificial per-call round-trip delay."""
+
+    def __init__(self, root: str, latency: float):
+        super().__init__(root)
+        self.latency = latency
+
+    def head(self, key):
+        time.sleep(self.latency)
+        return super().head(key)
+
+    def open(self, key, byte_range=None):
+        time.sleep(self.latency)
+        return super().open(key, byte_range)
+
+
+async def run(total: int, latency: float) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def fetch() -> int:
+            resp = await client.get(f"/api/v1/upload/media/{KEY}")
+            return resp.status_code
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*[fetch() for _ in range(total)])
+        elapsed = time.perf_counter() - started
+
+    bad = [s for s in statuses if s != 200]
+    if bad:
+        sys.exit(f"❌ {len(bad)} requests failed: {sorted(set(bad))}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per storage call")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(_tmp, "media"), exist_ok=True)
+    with open(os.path.join(_tmp, KEY), "wb") as f:
+        f.write(os.urandom(256 * 1024))
+    set_storage(SlowStorage(_tmp, args.latency))
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    elapsed = asyncio.run(run(args.requests, args.latency))
+    serial = args.requests * args.latency
+    print(f"Requests:     {args.requests} concurrent, {args.latency * 1000:.0f} ms per storage call")
+    print(f"Wall time:    {elapsed:.2f} s (serialised would be ~{serial:.2f} s)")
+    print(f"Overlap:      {serial / elapsed:.1f}x")
+
+    if elapsed > serial / 2:
+        sys.exit("❌ Media requests serialised on blocking storage I/O")
+    print("✅ Media requests overlap")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Delete stored media that no project, blog post or service references.
+Usage: python gc_media.py [--prefix media/] [--grace-hours 24] [--dry-run]
+
+Lists the bucket (or static/ when S3 is not configured) under --prefix,
+diffs it against every image column and removes the leftovers with batched
+delete_objects calls (1000 keys each). Objects younger than --grace-hours
+are kept, so files uploaded but not yet attached to a row survive.
+Run with --dry-run first to see what would go.
+"""
+
+import argparse
+import json
+from datetime import timedelta
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.utils.media import collect_garbage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prefix", default="media/", help="only consider keys under this prefix")
+    parser.add_argument("--grace-hours", type=int, default=settings.MEDIA_GC_GRACE_HOURS)
+    parser.add_argument("--dry-run", action="store_true", help="report without deleting")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = collect_garbage(
+            db,
+            prefix=args.prefix,
+            grace=timedelta(hours=args.grace_hours),
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    if report["dry_run"]:
+        print(f"🔎 Dry run: {report['garbage']} of {report['scanned']} objects are unreferenced")
+    else:
+        print(f"✅ Deleted {report['deleted']} objects, freed {report['bytes_freed'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
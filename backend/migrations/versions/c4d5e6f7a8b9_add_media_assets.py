@@ -0,0 +1,64 @@
+"""Add media_assets table and image_meta columns
+
+Revision ID: c4d5e6f7a8b9
+Revises: xxxxxx
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'xxxxxx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IMAGE_META_TABLES = ('projects', 'project_images', 'blog_posts', 'services')
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+    existing_tables = inspector.get_table_names()
+
+    # Create media_assets table if it doesn't exist
+    if 'media_assets' not in existing_tables:
+        op.create_table(
+            'media_assets',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('key', sa.String(length=500), nullable=False),
+            sa.Column('width', sa.Integer(), nullable=True),
+            sa.Column('height', sa.Integer(), nullable=True),
+            sa.Column('placeholder', sa.Text(), nullable=True),
+            sa.Column('dominant_color', sa.String(length=7), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f('ix_media_assets_id'), 'media_assets', ['id'], unique=False)
+        op.create_index(op.f('ix_media_assets_key'), 'media_assets', ['key'], unique=True)
+
+    # Add image_meta to every table holding image references
+    for table in IMAGE_META_TABLES:
+        existing_columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'image_meta' not in existing_columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('image_meta', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+
+    for table in IMAGE_META_TABLES:
+        existing_columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'image_meta' in existing_columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column('image_meta')
+
+    if 'media_assets' in inspector.get_table_names():
+        op.drop_index(op.f('ix_media_assets_key'), table_name='media_assets')
+        op.drop_index(op.f('ix_media_assets_id'), table_name='media_assets')
+        op.drop_table('media_assets')
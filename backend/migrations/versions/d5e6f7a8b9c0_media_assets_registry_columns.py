@@ -0,0 +1,51 @@
+"""Add size/content_type/sha256/ref_count to media_assets
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+    existing_columns = [col['name'] for col in inspector.get_columns('media_assets')]
+
+    with op.batch_alter_table('media_assets') as batch_op:
+        if 'size' not in existing_columns:
+            batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        if 'content_type' not in existing_columns:
+            batch_op.add_column(sa.Column('content_type', sa.String(length=100), nullable=True))
+        if 'sha256' not in existing_columns:
+            batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        if 'ref_count' not in existing_columns:
+            batch_op.add_column(sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'))
+
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('media_assets')]
+    if 'ix_media_assets_sha256' not in existing_indexes:
+        op.create_index(op.f('ix_media_assets_sha256'), 'media_assets', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+    existing_columns = [col['name'] for col in inspector.get_columns('media_assets')]
+
+    if 'ix_media_assets_sha256' in [ix['name'] for ix in inspector.get_indexes('media_assets')]:
+        op.drop_index(op.f('ix_media_assets_sha256'), table_name='media_assets')
+
+    with op.batch_alter_table('media_assets') as batch_op:
+        for column in ('ref_count', 'sha256', 'content_type', 'size'):
+            if column in existing_columns:
+                batch_op.drop_column(column)
@@ -0,0 +1,68 @@
+"""Add project_images.updated_at, keyset indexes, NOT NULL testimonials.order_index
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns) backing the list endpoints' keyset sort keys
+KEYSET_INDEXES = (
+    ('ix_projects_created_at_id', 'projects', ['created_at', 'id']),
+    ('ix_contact_submissions_created_at_id', 'contact_submissions', ['created_at', 'id']),
+    ('ix_blog_posts_date_id', 'blog_posts', ['date', 'id']),
+    ('ix_testimonials_order_index_id', 'testimonials', ['order_index', 'id']),
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+    existing_columns = [col['name'] for col in inspector.get_columns('project_images')]
+
+    if 'updated_at' not in existing_columns:
+        # Added without a default so existing rows stay NULL and the
+        # validators fall back to created_at; new rows get now()
+        with op.batch_alter_table('project_images') as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        with op.batch_alter_table('project_images') as batch_op:
+            batch_op.alter_column('updated_at', server_default=sa.func.now())
+
+    # NULL never compares in the (order_index, id) row-value cursor
+    # predicate, so a NULL row would end the keyset walk early
+    op.execute("UPDATE testimonials SET order_index = 0 WHERE order_index IS NULL")
+    with op.batch_alter_table('testimonials') as batch_op:
+        batch_op.alter_column(
+            'order_index', existing_type=sa.Integer(), nullable=False, server_default='0'
+        )
+
+    for name, table, columns in KEYSET_INDEXES:
+        if name not in [ix['name'] for ix in inspector.get_indexes(table)]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    inspector = Inspector.from_engine(connection)
+    existing_columns = [col['name'] for col in inspector.get_columns('project_images')]
+
+    for name, table, _ in KEYSET_INDEXES:
+        if name in [ix['name'] for ix in inspector.get_indexes(table)]:
+            op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('testimonials') as batch_op:
+        batch_op.alter_column('order_index', existing_type=sa.Integer(), nullable=True, server_default=None)
+
+    if 'updated_at' in existing_columns:
+        with op.batch_alter_table('project_images') as batch_op:
+            batch_op.drop_column('updated_at')
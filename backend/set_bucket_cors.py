@@ -25,7 +25,8 @@ cors_config = {
     "CORSRules": [
         {
             "AllowedHeaders": ["*"],
-            "AllowedMethods": ["GET", "HEAD"],
+            # PUT/POST: admin panel uploads straight to the bucket with presigned URLs
+            "AllowedMethods": ["GET", "HEAD", "PUT", "POST"],
             "AllowedOrigins": [
                 "https://entourage-av.vercel.app",
                 "http://localhost:3000",
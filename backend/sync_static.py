@@ -0,0 +1,83 @@
+"""
+Copy the local static/ tree to the S3 bucket and point the DB at it.
+Usage: python sync_static.py [--prefix projects/] [--jobs 16]
+                             [--format url|key] [--no-rewrite] [--dry-run]
+
+Uploads every file under static/ (UPLOAD_DIR) to the configured bucket
+under the same key, concurrently, with at most --jobs uploads at a time.
+The bucket is listed once up front. Files whose size and MD5/ETag already
+match the stored object are skipped, so the sync is cheap to re-run and
+resumes after an interruption.
+
+Image columns that still hold /static/... URLs for synced files are then
+rewritten in batched UPDATEs.
+  - --format url (the default) stores the media proxy URL, the same form
+    new uploads store.
+  - --format key stores the bare media key.
+Run with --dry-run first to see what would be uploaded and rewritten.
+"""
+
+import argparse
+import json
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.storage import LocalStorage, S3Storage
+from app.utils.static_sync import SyncReport, rewrite_static_references, sync_static
+
+
+def print_progress(report: SyncReport) -> None:
+    r = report.as_dict()
+    done = r["uploaded"] + r["unchanged"] + r["failed"]
+    print(
+        f"… {done}/{report.scanned} files | {r['uploaded']} uploaded, {r['unchanged']} unchanged, "
+        f"{r['failed']} failed | {r['files_per_s']} files/s, {r['mb_per_s']} MB/s",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prefix", default="", help="only sync keys under this prefix")
+    parser.add_argument("--jobs", type=int, default=16, help="concurrent uploads")
+    parser.add_argument("--format", choices=["url", "key"], default="url",
+                        help="what to store in rewritten image columns")
+    parser.add_argument("--no-rewrite", action="store_true", help="upload only, leave the DB alone")
+    parser.add_argument("--dry-run", action="store_true", help="report without uploading or updating")
+    args = parser.parse_args()
+
+    if not settings.use_s3:
+        parser.error("S3 is not configured")
+    # Cap at the client's connection pool; extra threads would only queue for a connection
+    jobs = max(1, min(args.jobs, settings.S3_MAX_POOL_CONNECTIONS))
+
+    remote = S3Storage()
+    report = SyncReport()
+    synced = sync_static(
+        LocalStorage(),
+        remote,
+        prefix=args.prefix,
+        jobs=jobs,
+        dry_run=args.dry_run,
+        report=report,
+        progress=print_progress,
+    )
+
+    if not args.no_rewrite:
+        to_reference = remote.url if args.format == "url" else str
+        db = SessionLocal()
+        try:
+            report.rewritten = rewrite_static_references(db, synced, to_reference, dry_run=args.dry_run)
+        finally:
+            db.close()
+
+    result = report.as_dict()
+    print(json.dumps(result, indent=2))
+    prefix = "🔎 Dry run: would upload" if args.dry_run else "✅ Uploaded"
+    print(f"{prefix} {result['uploaded']} files ({result['bytes_uploaded'] / 1024 / 1024:.1f} MB), "
+          f"{result['unchanged']} already in the bucket, {result['failed']} failed; "
+          f"{result['rewritten_references']} DB references rewritten")
+
+
+if __name__ == "__main__":
+    main()
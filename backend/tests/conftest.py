@@ -0,0 +1,59 @@
+import io
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when the app is imported, so point it at a throwaway
+# SQLite database and upload directory (and away from S3) first.
+_TMP = tempfile.mkdtemp(prefix="entourage-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_TMP}/test.db",
+    UPLOAD_DIR=os.path.join(_TMP, "static"),
+    S3_ENDPOINT="",
+    ADMIN_USERNAME="admin",
+    ADMIN_PASSWORD="test-password",
+    DEBUG="false",
+    ENVIRONMENT="test",
+)
+os.makedirs(os.environ["UPLOAD_DIR"], exist_ok=True)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.response_cache import get_response_cache  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    get_response_cache().clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_client(client):
+    response = client.post("/api/v1/auth/login", json={"username": "admin", "password": "test-password"})
+    assert response.status_code == 200, response.text
+    return client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def jpeg():
+    """Factory for small in-memory JPEGs; vary `color` to get distinct content."""
+    from PIL import Image
+
+    def make(width: int = 64, height: int = 48, color=(200, 30, 30)) -> bytes:
+        buffer = io.BytesIO()
+        Image.new("RGB", (width, height), color).save(buffer, "JPEG")
+        return buffer.getvalue()
+
+    return make
@@ -0,0 +1,84 @@
+import hashlib
+import io
+
+import pytest
+
+from app.crud.media import media_asset
+from app.models.media import MediaAsset
+from app.schemas.media import MediaAssetCreate
+from app.storage.local import LocalStorage
+from app.utils.backfill import Manifest, backfill
+from app.utils.files import content_key, is_content_key
+from app.utils.image_executor import ImageExecutor
+
+
+@pytest.fixture
+def executor():
+    pool = ImageExecutor(workers=1, queue_size=1)
+    yield pool
+    pool.shutdown()
+
+
+def _noisy_jpeg(width: int, height: int) -> bytes:
+    """A large, barely compressible JPEG, so re-encoding always saves bytes."""
+    import os
+    from PIL import Image
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=100)
+    return buffer.getvalue()
+
+
+def _read(storage: LocalStorage, key: str) -> bytes:
+    return b"".join(storage.open(key).iter_chunks(65536))
+
+
+def test_is_content_key():
+    assert is_content_key(content_key("ab" * 32, "jpeg"))
+    assert not is_content_key("projects/photo.jpg")
+    assert not is_content_key("media/ab12-640w.webp")
+
+
+def test_backfill_never_rewrites_content_addressed_originals(tmp_path, executor):
+    storage = LocalStorage(str(tmp_path / "store"))
+    data = _noisy_jpeg(800, 600)
+    addressed = content_key("0123456789abcdef" * 4, "jpg")
+    storage.save(addressed, data, "image/jpeg")
+    storage.save("projects/legacy.jpg", data, "image/jpeg")
+
+    report = backfill(
+        [("local", storage)], Manifest(str(tmp_path / "manifest.json")), executor,
+        jobs=2, max_width=400, quality=50,
+    )
+
+    assert report.failed == 0, report.errors
+    assert report.optimized == 1
+    assert report.derivatives_only == 1
+    assert _read(storage, addressed) == data
+    assert len(_read(storage, "projects/legacy.jpg")) < len(data)
+    # Both originals still get their derivative ladder
+    keys = {info.key for info in storage.list("")}
+    assert any(k.startswith(addressed.rsplit(".", 1)[0] + "-") for k in keys)
+    assert any(k.startswith("projects/legacy-") for k in keys)
+
+
+def test_backfill_registers_digest_of_rewritten_original(tmp_path, executor, db):
+    storage = LocalStorage(str(tmp_path / "store"))
+    data = _noisy_jpeg(800, 600)
+    storage.save("projects/stale.jpg", data, "image/jpeg")
+    storage.save("projects/fresh.jpg", _noisy_jpeg(800, 600), "image/jpeg")
+    media_asset.register(db, obj_in=MediaAssetCreate(
+        key="projects/stale.jpg", size=len(data), content_type="image/jpeg",
+        sha256=hashlib.sha256(data).hexdigest(),
+    ))
+
+    report = backfill(
+        [("local", storage)], Manifest(str(tmp_path / "manifest.json")), executor,
+        db=db, registry_source="local", jobs=2, max_width=400, quality=50,
+    )
+
+    assert report.optimized == 2, report.errors
+    for key in ("projects/stale.jpg", "projects/fresh.jpg"):
+        asset = db.query(MediaAsset).filter(MediaAsset.key == key).one()
+        assert asset.sha256 == hashlib.sha256(_read(storage, key)).hexdigest()
+        assert asset.content_type == "image/jpeg"
@@ -0,0 +1,27 @@
+import time
+
+from app.storage.breaker import CLOSED, OPEN, CircuitBreaker, guarded
+
+
+class _SlowBackend:
+    def __init__(self):
+        self.breaker = CircuitBreaker("test", failure_threshold=2, slow_call=0.01, reset_timeout=60)
+
+    @guarded
+    def head(self, key):
+        time.sleep(0.02)
+
+    @guarded(timed=False)
+    def save_file(self, key, path, content_type):
+        time.sleep(0.02)
+
+
+def test_slow_upload_does_not_open_breaker():
+    backend = _SlowBackend()
+    for _ in range(3):
+        backend.save_file("media/big.mp4", "/tmp/big.mp4", "video/mp4")
+    assert backend.breaker.state == CLOSED
+
+    backend.head("media/big.mp4")
+    backend.head("media/big.mp4")
+    assert backend.breaker.state == OPEN
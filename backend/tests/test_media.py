@@ -0,0 +1,77 @@
+import os
+import time
+from datetime import timedelta
+
+from app.storage import get_storage
+from app.utils import media_cleanup
+from app.utils.files import content_key
+from app.utils.images import derivative_key
+from app.utils.media_cleanup import MediaCleanup
+
+
+def _store(*keys: str, age_hours: float = 0) -> None:
+    storage = get_storage()
+    for key in keys:
+        storage.save(key, b"x", "image/jpeg")
+        if age_hours:
+            stamp = time.time() - age_hours * 3600
+            os.utime(storage.path(key), (stamp, stamp))
+
+
+def _remaining(prefix: str) -> set:
+    return {info.key for info in get_storage().list(prefix)}
+
+
+def test_cleanup_removes_every_derivative_including_quality_variants():
+    key = content_key("fe" * 32, "jpg")
+    variants = [
+        derivative_key(key, 640, "webp"),
+        derivative_key(key, 640, "webp", quality=60),
+        derivative_key(key, 1234, "jpeg", quality=40),
+    ]
+    neighbour = key.replace(".jpg", "-2.jpg")  # another original sharing the prefix
+    _store(key, *variants, neighbour, age_hours=48)
+
+    cleanup = MediaCleanup(grace=timedelta(hours=24))
+    cleanup._process({key})
+
+    assert _remaining(key.rsplit(".", 1)[0]) == {neighbour}
+    assert cleanup.stats()["deleted"] == 1
+
+
+def test_cleanup_spares_objects_inside_the_grace_period():
+    fresh = content_key("fd" * 32, "jpg")
+    handed_out = content_key("fc" * 32, "jpg")
+    _store(fresh, derivative_key(fresh, 640, "webp"))
+    _store(handed_out, age_hours=48)
+
+    cleanup = MediaCleanup(grace=timedelta(hours=24))
+    cleanup.hold(handed_out)  # e.g. a deduplicated upload just returned it
+    cleanup._process({fresh, handed_out})
+
+    assert len(_remaining(fresh.rsplit(".", 1)[0])) == 2
+    assert _remaining(handed_out) == {handed_out}
+    assert cleanup.stats() == {"pending": 0, "deleted": 0, "skipped": 2, "failed": 0}
+
+
+def test_cleanup_lists_each_directory_once(monkeypatch):
+    keys = [content_key(c * 64, "jpg") for c in "abc"]
+    _store(*keys, *(derivative_key(k, 640, "webp") for k in keys), age_hours=48)
+    storage = get_storage()
+    listed = []
+
+    class Counting:
+        def __getattr__(self, name):
+            return getattr(storage, name)
+
+        def list(self, prefix=""):
+            listed.append(prefix)
+            return storage.list(prefix)
+
+    monkeypatch.setattr(media_cleanup, "get_storage", lambda: Counting())
+    cleanup = MediaCleanup(grace=timedelta(hours=24))
+    cleanup._process(set(keys))
+
+    assert listed == ["media/"]
+    assert cleanup.stats()["deleted"] == 3
+    assert not any(_remaining(k.rsplit(".", 1)[0]) for k in keys)
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database import engine
+from app.models.project import Project, ProjectImage
+from app.utils.response_cache import get_response_cache
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _add_projects(db, category: str, count: int, images_each: int = 2) -> None:
+    for n in range(count):
+        project = Project(
+            slug=f"{category}-{n}",
+            number=str(n),
+            title=f"Project {n}",
+            category=category,
+            location="Somewhere",
+            description="A project",
+        )
+        project.images = [
+            ProjectImage(before_image=f"before-{n}-{i}.jpg", after_image=f"after-{n}-{i}.jpg", order_index=i)
+            for i in range(images_each)
+        ]
+        db.add(project)
+    db.commit()
+
+
+def test_project_list_query_count_is_independent_of_row_count(client, db):
+    _add_projects(db, "few", 5)
+    _add_projects(db, "many", 100)
+
+    counts = {}
+    for category, expected in (("few", 5), ("many", 100)):
+        with count_queries() as statements:
+            response = client.get("/api/v1/projects/", params={"category": category})
+        assert response.status_code == 200
+        projects = response.json()
+        assert len(projects) == expected
+        assert all(len(p["images"]) == 2 for p in projects)
+        counts[category] = len(statements)
+
+    # Collection validator, the page of projects, and one IN-load for all their images
+    assert counts == {"few": 3, "many": 3}
+
+
+@contextmanager
+def count_checkouts():
+    checkouts = []
+
+    def record(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    event.listen(engine.pool, "checkout", record)
+    try:
+        yield checkouts
+    finally:
+        event.remove(engine.pool, "checkout", record)
+
+
+def test_project_list_validator_shares_the_request_session(client, db):
+    _add_projects(db, "conditional", 3)
+    url, params = "/api/v1/projects/", {"category": "conditional"}
+
+    with count_checkouts() as checkouts:
+        response = client.get(url, params=params)
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "MISS"
+    assert len(checkouts) == 1  # validator and body read through one session
+
+    etag = response.headers["etag"]
+    client.get(url, params=params)  # now cached
+    with count_queries() as statements:
+        hit = client.get(url, params=params, headers={"If-None-Match": etag})
+    assert hit.status_code == 304
+    assert statements == []
+
+    # A miss with a current ETag: only the validator runs, not the list query
+    get_response_cache().clear()
+    with count_queries() as statements:
+        miss = client.get(url, params=params, headers={"If-None-Match": etag})
+    assert miss.status_code == 304
+    assert miss.headers["etag"] == etag
+    assert miss.content == b""
+    assert len(statements) == 1
+    assert get_response_cache().stats()["routes"]["/api/v1/projects/"]["not_modified"] == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_cancelling_the_first_caller_does_not_fail_the_others():
+    async def run():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "data"
+
+        leader = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert not waiter.done()
+
+        release.set()
+        assert await waiter == "data"
+        assert calls == [1]
+        assert len(flight) == 0
+
+    asyncio.run(run())
+
+
+def test_failures_reach_every_caller_and_are_not_cached():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise KeyError("missing")
+
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, KeyError) for r in results)
+        assert len(flight) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,39 @@
+from app.models.testimonial import Testimonial
+
+
+def _walk(client, url: str, limit: int) -> list:
+    """Follow X-Next-Cursor until the last page; returns every row's id."""
+    ids, params = [], {"limit": limit}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_cursor_walk_covers_every_testimonial_in_display_order(admin_client, db):
+    db.add_all(
+        Testimonial(name=f"Client {n}", location="Paris", text="Great", order_index=n % 3)
+        for n in range(12)
+    )
+    db.commit()
+    expected = [t.id for t in db.query(Testimonial).order_by(Testimonial.order_index, Testimonial.id)]
+
+    assert _walk(admin_client, "/api/v1/testimonials/", limit=5) == expected
+
+
+def test_order_index_defaults_and_rejects_null(admin_client):
+    created = admin_client.post(
+        "/api/v1/testimonials/", json={"name": "A", "location": "Lyon", "text": "Good"}
+    ).json()
+    assert created["order_index"] == 0
+
+    response = admin_client.put(f"/api/v1/testimonials/{created['id']}", json={"order_index": None})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "order_index"]
+    response = admin_client.put(f"/api/v1/testimonials/{created['id']}", json={"text": "Better"})
+    assert response.status_code == 200
+    assert response.json()["order_index"] == 0
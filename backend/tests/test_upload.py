@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.api.v1 import upload
+from app.models.project import Project
+from app.storage.disk_cache import MediaDiskCache
+from app.storage.local import LocalStorage
+from app.utils.http import if_range_matches
+
+
+def test_upload_batch_stores_each_file_and_reports_failures(admin_client, jpeg):
+    files = [
+        ("files", ("red.jpg", jpeg(color=(200, 30, 30)), "image/jpeg")),
+        ("files", ("notes.txt", b"not an image", "text/plain")),
+        ("files", ("blue.jpg", jpeg(color=(30, 30, 200)), "image/jpeg")),
+    ]
+
+    response = admin_client.post("/api/v1/upload/batch", files=files)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["uploaded"] == 2
+    assert body["failed"] == 1
+    assert [r["filename"] for r in body["results"]] == ["red.jpg", "notes.txt", "blue.jpg"]
+    assert [r["success"] for r in body["results"]] == [True, False, True]
+    red, blue = body["results"][0], body["results"][2]
+    assert red["file_path"].startswith("media/") and blue["file_path"].startswith("media/")
+    assert red["file_path"] != blue["file_path"]
+
+
+def test_upload_batch_requires_admin(client, jpeg):
+    response = client.post("/api/v1/upload/batch", files=[("files", ("a.jpg", jpeg(), "image/jpeg"))])
+
+    assert response.status_code in (401, 403)
+
+
+def test_if_range_uses_strong_comparison():
+    # RFC 9110 §13.1.5: only an identical strong tag lets a range through
+    assert if_range_matches('"abc"', '"abc"')
+    assert not if_range_matches('W/"abc"', '"abc"')
+    assert not if_range_matches('"abc"', 'W/"abc"')
+    assert not if_range_matches('"abd"', '"abc"')
+    assert not if_range_matches("Sat, 17 Oct 2026 00:00:00 GMT", '"abc"')
+    assert not if_range_matches('"abc"', None)
+
+
+def test_delete_file_refuses_referenced_objects(admin_client, db):
+    db.add(Project(
+        slug="delete-guard", number="1", title="Guarded", category="test",
+        location="Paris", description="Uses the image", image="media/delete-guard.jpg",
+    ))
+    db.commit()
+
+    response = admin_client.delete("/api/v1/upload/media/delete-guard.jpg")
+    assert response.status_code == 409
+    assert admin_client.delete("/api/v1/upload/media/not-stored.jpg").status_code == 404
+
+
+class _CountingStorage(LocalStorage):
+    """Local storage with a slow lookup that records every lookup and read."""
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.lookups = 0
+        self.opens = []
+
+    def stat(self, key):
+        self.lookups += 1
+        time.sleep(0.05)
+        return super().stat(key)
+
+    def open(self, key, byte_range=None):
+        self.opens.append(byte_range)
+        return super().open(key, byte_range)
+
+
+@pytest.fixture
+def media(tmp_path, monkeypatch):
+    storage = _CountingStorage(str(tmp_path / "store"))
+    cache = MediaDiskCache(str(tmp_path / "cache"), max_bytes=1024 * 1024, max_object_size=1024 * 1024)
+    monkeypatch.setattr(upload, "get_storage", lambda: storage)
+    monkeypatch.setattr(upload, "get_media_cache", lambda: cache)
+    app = FastAPI()
+
+    @app.get("/media/{file_path:path}")
+    async def serve(request: Request, file_path: str):
+        return await upload._serve_object(request, file_path)
+
+    storage.save("media/photo.jpg", bytes(range(256)) * 40, "image/jpeg")
+    return app, storage, cache
+
+
+def _get_all(app, url: str, count: int, **kwargs) -> list:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get(url, **kwargs) for _ in range(count)))
+    return asyncio.run(run())
+
+
+def test_media_miss_streams_and_fills_the_cache(media):
+    app, storage, cache = media
+
+    (first,) = _get_all(app, "/media/media/photo.jpg", 1)
+    assert first.status_code == 200
+    assert first.content == bytes(range(256)) * 40
+    assert storage.opens == [None]
+    assert cache.get("media/photo.jpg") is not None
+
+    (second,) = _get_all(app, "/media/media/photo.jpg", 1)
+    assert second.content == first.content
+    assert storage.opens == [None]  # served from disk
+
+
+def test_media_evicted_by_another_worker_is_refilled(media):
+    app, storage, cache = media
+    _get_all(app, "/media/media/photo.jpg", 1)
+    # Another worker sharing the directory evicts the entry behind our back
+    os.remove(cache.data_path("media/photo.jpg"))
+    os.remove(cache.data_path("media/photo.jpg")[:-len(".bin")] + ".json")
+
+    (response,) = _get_all(app, "/media/media/photo.jpg", 1)
+    assert response.content == bytes(range(256)) * 40
+    assert storage.opens == [None, None]
+    assert os.path.exists(cache.data_path("media/photo.jpg"))
+
+    _get_all(app, "/media/media/photo.jpg", 1)
+    assert storage.opens == [None, None]  # served from disk again
+
+
+def test_media_range_miss_reads_only_the_range(media):
+    app, storage, cache = media
+
+    (response,) = _get_all(app, "/media/media/photo.jpg", 1, headers={"Range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert response.content == bytes(range(10))
+    assert storage.opens == ["bytes=0-9"]
+    assert cache.get("media/photo.jpg") is None
+
+
+def test_concurrent_media_misses_share_one_lookup(media):
+    app, storage, cache = media
+
+    responses = _get_all(app, "/media/media/photo.jpg", 10)
+    assert [r.status_code for r in responses] == [200] * 10
+    assert all(r.content == bytes(range(256)) * 40 for r in responses)
+    assert storage.lookups == 1
+
+    missing = _get_all(app, "/media/media/missing.jpg", 10)
+    assert [r.status_code for r in missing] == [404] * 10
+    assert storage.lookups == 2
@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { type AxiosInstance } from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '/api/v1';
 
@@ -73,4 +73,24 @@ function handleError(error: any) {
   );
 });
 
+// List endpoints return one page at a time (at most 100 rows) and send
+// X-Next-Cursor while more rows follow; this walks every page in turn.
+export async function getAllPages<T>(
+  instance: AxiosInstance,
+  url: string,
+  params: Record<string, unknown> = {}
+): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await instance.get<T[]>(url, {
+      params: { limit: 100, ...params, ...(cursor ? { cursor } : {}) },
+    });
+    if (!Array.isArray(response.data)) break;
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'] || undefined;
+  } while (cursor);
+  return items;
+}
+
 export default api;
\ No newline at end of file
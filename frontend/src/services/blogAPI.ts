@@ -1,4 +1,4 @@
-import api, { authApi } from './api';
+import api, { authApi, getAllPages } from './api';
 
 export interface BlogPost {
   id: number;
@@ -32,11 +32,8 @@ export interface BlogCreate {
 export const getAllBlogPosts = async (params?: {
   category?: string;
   search?: string;
-  skip?: number;
-  limit?: number;
 }): Promise<BlogPost[]> => {
-  const response = await api.get<BlogPost[]>('/blog/', { params });
-  return Array.isArray(response.data) ? response.data : [];
+  return getAllPages<BlogPost>(api, '/blog/', params);
 };
 
 export const getBlogPostById = async (id: number): Promise<BlogPost> => {
@@ -1,4 +1,4 @@
-import api, { authApi } from './api';
+import api, { authApi, getAllPages } from './api';
 
 export interface ContactSubmission {
   id: number;
@@ -46,8 +46,7 @@ export const submitContactForm = async (data: ContactFormData): Promise<ContactS
 // ── Admin endpoints (require session cookie) ───────────────────────────────────
 
 export const getAllContacts = async (): Promise<ContactSubmission[]> => {
-  const response = await authApi.get<ContactSubmission[]>('/contacts/');
-  return Array.isArray(response.data) ? response.data : [];
+  return getAllPages<ContactSubmission>(authApi, '/contacts/');
 };
 
 export const getContactById = async (id: number): Promise<ContactSubmission> => {
@@ -1,4 +1,4 @@
-import api, { authApi } from './api';
+import api, { authApi, getAllPages } from './api';
 
 export interface ProjectImage {
   id: number;
@@ -51,8 +51,7 @@ export interface ProjectImageCreate {
 
 export const getAllProjects = async (category?: string): Promise<Project[]> => {
   const params = category ? { category } : {};
-  const response = await api.get<Project[]>('/projects/', { params });
-  return Array.isArray(response.data) ? response.data : [];
+  return getAllPages<Project>(api, '/projects/', params);
 };
 
 export const getFeaturedProjects = async (limit: number = 3): Promise<Project[]> => {
@@ -1,4 +1,4 @@
-import api, { authApi } from './api';
+import api, { authApi, getAllPages } from './api';
 
 export interface Testimonial {
   id: number;
@@ -28,8 +28,7 @@ export interface TestimonialCreate {
 // ── Public endpoints ───────────────────────────────────────────────────────────
 
 export const getActiveTestimonials = async (): Promise<Testimonial[]> => {
-  const response = await api.get<Testimonial[]>('/testimonials/active');
-  return Array.isArray(response.data) ? response.data : [];
+  return getAllPages<Testimonial>(api, '/testimonials/active');
 };
 
 export const getFeaturedTestimonials = async (limit: number = 3): Promise<Testimonial[]> => {
@@ -45,8 +44,7 @@ export const getTestimonialById = async (id: number): Promise<Testimonial> => {
 // ── Admin endpoints (require session cookie) ───────────────────────────────────
 
 export const getAllTestimonials = async (): Promise<Testimonial[]> => {
-  const response = await authApi.get<Testimonial[]>('/testimonials');
-  return Array.isArray(response.data) ? response.data : [];
+  return getAllPages<Testimonial>(authApi, '/testimonials');
 };
 
 export const createTestimonial = async (data: TestimonialCreate): Promise<Testimonial> => {